@@ -0,0 +1,273 @@
+"""
+مقياس أداء خط بيانات التدريب
+Training Data Pipeline Benchmark
+
+Runs prepare_training_example, validate_quality, export_training_jsonl and
+get_quality_statistics on synthetic bilingual corpora and reports throughput,
+p50/p99 latency per example and peak RSS. Each stage runs in a fresh child
+process so its peak RSS is its own. Standard library only.
+
+    python lib/training-benchmark.py --sizes 1000,100000 --output bench.json
+    python lib/training-benchmark.py --baseline bench-baseline.json --threshold 0.15
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List
+
+from training_system import SOURCE_TYPES, AdvancedAITrainingSystem, JsonlSink
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+# Distinct template texts; every example also gets a unique suffix so the
+# analysis cache cannot short-circuit the work
+POOL_SIZE = 512
+EXPORT_CHUNK = 10_000
+
+ARABIC_SENTENCES = [
+    "الذكاء الاصطناعي يغيّر طريقة عملنا في مجالات كثيرة",
+    "تظهر الدراسات الحديثة تحسناً ملحوظاً في دقة النماذج",
+    "يجب مراجعة المصادر والتحقق من موثوقيتها قبل الاعتماد عليها",
+    "تعتمد جودة النتائج على جودة البيانات المستخدمة في التدريب",
+    "البرمجة الجيدة تبدأ بفهم واضح للمشكلة ومتطلباتها",
+]
+ENGLISH_SENTENCES = [
+    "Recent research shows steady progress in model accuracy",
+    "Careful evaluation is required before deploying any system to production",
+    "The benchmark compares several approaches under identical conditions",
+    "Structured responses with citations are easier to verify",
+    "Performance depends heavily on the quality of the training data",
+]
+
+
+def synthetic_response(rng: random.Random) -> str:
+    """One markdown response with headings, lists, citations and confidence markers"""
+    sentences = ARABIC_SENTENCES if rng.random() < 0.5 else ENGLISH_SENTENCES
+    parts = [f"## {rng.choice(sentences)}"]
+    for section in range(rng.randint(2, 5)):
+        parts.append(f"\n### {section + 1}. {rng.choice(sentences)}")
+        for _ in range(rng.randint(2, 6)):
+            citation = f" [{rng.choice(SOURCE_TYPES)}:{rng.randint(1, 9)}:{rng.randint(2015, 2025)}]"
+            parts.append(f"{rng.choice(sentences)}{citation if rng.random() < 0.6 else ''}.")
+        for _ in range(rng.randint(0, 4)):
+            parts.append(f"- {rng.choice(sentences)}")
+        if rng.random() < 0.2:
+            parts.append(f"[{rng.randint(50, 99)}% confidence]")
+    if rng.random() < 0.5:
+        parts.append("\n## Summary" if sentences is ENGLISH_SENTENCES else "\n## خاتمة")
+    return "\n".join(parts)
+
+
+def synthetic_corpus(size: int, seed: int = 0) -> Iterator[str]:
+    """Stream size distinct responses built from a fixed pool of templates"""
+    rng = random.Random(seed)
+    pool = [synthetic_response(rng) for _ in range(POOL_SIZE)]
+    for i in range(size):
+        yield f"{pool[i % POOL_SIZE]}\n\n<!-- {i} -->"
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def summarize(latencies: List[float], items: int, elapsed: float) -> Dict[str, float]:
+    latencies.sort()
+    return {
+        "items": items,
+        "seconds": elapsed,
+        "throughput_per_s": items / elapsed if elapsed else 0.0,
+        "p50_us": percentile(latencies, 0.50) * 1e6,
+        "p99_us": percentile(latencies, 0.99) * 1e6,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def timed_loop(size: int, step: Callable[[int, str], None]) -> Dict[str, float]:
+    latencies = []
+    clock = time.perf_counter
+    start = clock()
+    for i, text in enumerate(synthetic_corpus(size)):
+        t0 = clock()
+        step(i, text)
+        latencies.append(clock() - t0)
+    return summarize(latencies, size, clock() - start)
+
+
+def bench_prepare(size: int) -> Dict[str, float]:
+    system = AdvancedAITrainingSystem()
+    sources = [{"type": "peer", "number": 1, "year": 2024, "title": "Synthetic Source"}]
+    return timed_loop(size, lambda i, text: system.prepare_training_example(
+        f"question {i}", text, sources, 9.0
+    ))
+
+
+def bench_validate(size: int) -> Dict[str, float]:
+    system = AdvancedAITrainingSystem()
+    return timed_loop(size, lambda i, text: system.validate_quality(text))
+
+
+def bench_export(size: int) -> Dict[str, float]:
+    # Exported in chunks (append mode) so memory stays bounded at 1M examples.
+    # Latency is timed around each JsonlSink.write, so the writes that spill
+    # the buffer to disk show up in p99; throughput covers the whole export
+    system = AdvancedAITrainingSystem()
+    sources = [{"type": "tech", "number": 1, "year": 2024}]
+    latencies = []
+    elapsed = 0.0
+    clock = time.perf_counter
+    write = JsonlSink.write
+
+    def timed_write(sink, example):
+        t0 = clock()
+        write(sink, example)
+        latencies.append(clock() - t0)
+
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    JsonlSink.write = timed_write
+    try:
+        corpus = synthetic_corpus(size)
+        for chunk_start in range(0, size, EXPORT_CHUNK):
+            count = min(EXPORT_CHUNK, size - chunk_start)
+            system.training_examples = [
+                system.prepare_training_example(f"question {chunk_start + j}", next(corpus), sources, 9.0)
+                for j in range(count)
+            ]
+            t0 = clock()
+            with open(os.devnull, "w") as devnull:
+                stdout, sys.stdout = sys.stdout, devnull
+                try:
+                    system.export_training_jsonl(path, append=chunk_start > 0)
+                finally:
+                    sys.stdout = stdout
+            elapsed += clock() - t0
+    finally:
+        JsonlSink.write = write
+        os.remove(path)
+    return summarize(latencies, size, elapsed)
+
+
+def bench_statistics(size: int) -> Dict[str, float]:
+    # Statistics over size recorded scores, queried once per 100 examples
+    system = AdvancedAITrainingSystem()
+    for metric in system.quality_metrics.values():
+        metric.extend(float(i % 11) for i in range(size))
+    calls = max(1, size // 100)
+    latencies = []
+    clock = time.perf_counter
+    start = clock()
+    for _ in range(calls):
+        t0 = clock()
+        system.get_quality_statistics()
+        latencies.append(clock() - t0)
+    return summarize(latencies, calls, clock() - start)
+
+
+STAGES = {
+    "prepare_training_example": bench_prepare,
+    "validate_quality": bench_validate,
+    "export_training_jsonl": bench_export,
+    "get_quality_statistics": bench_statistics,
+}
+
+
+def run_stage(stage: str, size: int) -> Dict[str, float]:
+    return STAGES[stage](size)
+
+
+def run(sizes: List[int], stages: List[str], quiet: bool = False) -> Dict:
+    results: Dict[str, Dict[str, Dict[str, float]]] = {stage: {} for stage in stages}
+    for size in sizes:
+        for stage in stages:
+            # A fresh process per stage so peak RSS is not inherited
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = executor.submit(run_stage, stage, size).result()
+            results[stage][str(size)] = result
+            if not quiet:
+                print(
+                    f"{stage:26s} {size:>9d}  {result['throughput_per_s']:>12.0f}/s  "
+                    f"p50 {result['p50_us']:8.1f}us  p99 {result['p99_us']:8.1f}us  "
+                    f"rss {result['peak_rss_mb']:7.1f}MB"
+                )
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Regressions beyond threshold (fractional) in throughput or p99 latency"""
+    regressions = []
+    for stage, sizes in current["results"].items():
+        for size, result in sizes.items():
+            base = baseline.get("results", {}).get(stage, {}).get(size)
+            if not base:
+                continue
+            if result["throughput_per_s"] < base["throughput_per_s"] * (1 - threshold):
+                regressions.append(
+                    f"{stage}[{size}] throughput {result['throughput_per_s']:.0f}/s "
+                    f"< baseline {base['throughput_per_s']:.0f}/s"
+                )
+            if base["p99_us"] and result["p99_us"] > base["p99_us"] * (1 + threshold):
+                regressions.append(
+                    f"{stage}[{size}] p99 {result['p99_us']:.1f}us > baseline {base['p99_us']:.1f}us"
+                )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Training data pipeline benchmark")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="comma-separated corpus sizes")
+    parser.add_argument("--stages", default=",".join(STAGES),
+                        help="comma-separated stages to run")
+    parser.add_argument("--output", default="training-benchmark.json", help="results JSON file")
+    parser.add_argument("--baseline", help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed fractional regression vs baseline (default 0.10)")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    stages = [stage for stage in args.stages.split(",") if stage]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    current = run(sizes, stages, quiet=args.quiet)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            return 1
+        if not args.quiet:
+            print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
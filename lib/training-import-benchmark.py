@@ -0,0 +1,127 @@
+"""
+قياس زمن استيراد نظام التدريب
+Training System Import-Time Benchmark
+
+Starts a fresh interpreter per run with ``python -X importtime`` and reports,
+for each scenario, the median wall time of the import statement, the summed
+self time of every module it imported and the slowest modules. Use it to
+keep short-lived shard jobs and worker processes fast to start.
+
+    python lib/training-import-benchmark.py --runs 15
+    python lib/training-import-benchmark.py --legacy old/ultra-enhanced-training-system.py
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+LIB_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SCENARIOS = {
+    "package": "import training_system",
+    "system": "from training_system import AdvancedAITrainingSystem",
+    "generator": "import training_system.generator",
+    "shim": (
+        "import importlib.util; "
+        "spec = importlib.util.spec_from_file_location('ultra_enhanced_training_system', "
+        f"{os.path.join(LIB_DIR, 'ultra-enhanced-training-system.py')!r}); "
+        "module = importlib.util.module_from_spec(spec); spec.loader.exec_module(module)"
+    ),
+}
+
+
+def legacy_scenario(path: str) -> str:
+    """Load a single-file module by path, the way the scripts used to"""
+    return (
+        "import importlib.util, sys; "
+        f"spec = importlib.util.spec_from_file_location('ultra_enhanced_training_system', {path!r}); "
+        "module = importlib.util.module_from_spec(spec); sys.modules[spec.name] = module; "
+        "spec.loader.exec_module(module)"
+    )
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) for each line of -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def run_once(statement: str) -> Tuple[float, List[Tuple[str, int, int]]]:
+    code = (
+        "import time; _start = time.perf_counter(); "
+        f"{statement}; "
+        "print(time.perf_counter() - _start)"
+    )
+    env = dict(os.environ, PYTHONPATH=LIB_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1]), parse_importtime(result.stderr)
+
+
+def measure(statement: str, runs: int, top: int) -> Dict:
+    # The first run writes the bytecode cache; it is not counted
+    run_once(statement)
+    walls = []
+    totals = []
+    modules: Dict[str, List[int]] = {}
+    for _ in range(runs):
+        wall, rows = run_once(statement)
+        walls.append(wall)
+        totals.append(sum(self_us for _, self_us, _ in rows))
+        for name, self_us, _ in rows:
+            modules.setdefault(name, []).append(self_us)
+    slowest = sorted(
+        ((name, statistics.median(times)) for name, times in modules.items()),
+        key=lambda item: item[1],
+        reverse=True
+    )[:top]
+    return {
+        "statement": statement,
+        "wall_ms": statistics.median(walls) * 1e3,
+        "import_self_ms": statistics.median(totals) / 1e3,
+        "modules": len(modules),
+        "slowest_us": dict(slowest),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Training system import-time benchmark")
+    parser.add_argument("--runs", type=int, default=9, help="fresh interpreters per scenario")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help="comma-separated scenarios to run")
+    parser.add_argument("--legacy", help="also time loading this single-file module by path")
+    parser.add_argument("--top", type=int, default=5, help="slowest modules to list per scenario")
+    parser.add_argument("--output", help="write results JSON here")
+    args = parser.parse_args(argv)
+
+    scenarios = {name: SCENARIOS[name] for name in args.scenarios.split(",") if name}
+    if args.legacy:
+        scenarios["legacy"] = legacy_scenario(os.path.abspath(args.legacy))
+
+    results = {}
+    for name, statement in scenarios.items():
+        result = results[name] = measure(statement, args.runs, args.top)
+        print(f"{name:10s} wall {result['wall_ms']:7.1f}ms  "
+              f"imports {result['import_self_ms']:7.1f}ms  modules {result['modules']:4d}")
+        for module, self_us in result["slowest_us"].items():
+            print(f"    {self_us:9.0f}us  {module}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "runs": args.runs, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
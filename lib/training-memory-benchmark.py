@@ -0,0 +1,80 @@
+"""
+قياس استهلاك الذاكرة لأمثلة التدريب
+Training Example Memory Benchmark
+
+Compares bytes per example held in RAM for the legacy dict-based
+representation (metadata, sources and source types as dicts) and the slotted
+TrainingExample / ExampleMetadata / Source representation, using tracemalloc.
+
+    python lib/training-memory-benchmark.py [corpus.jsonl] [--count N]
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from training_system import example_from_dict
+
+DEFAULT_CORPUS = Path(__file__).parent.parent / "training" / "training_data_enhanced.jsonl"
+
+
+@dataclass
+class LegacyTrainingExample:
+    """The pre-slots representation: a plain dataclass with dict metadata"""
+    instruction: str
+    input: str
+    output: str
+    metadata: Dict
+
+
+def build_legacy(record: Dict) -> LegacyTrainingExample:
+    return LegacyTrainingExample(**record)
+
+
+def build_compact(record: Dict):
+    return example_from_dict(record)
+
+
+def measure(lines: List[str], count: int, build: Callable) -> float:
+    """Bytes per example retained after building count examples"""
+    gc.collect()
+    tracemalloc.start()
+    examples = []
+    for i in range(count):
+        # Parse every time so each example owns its strings, as when loading a file
+        examples.append(build(json.loads(lines[i % len(lines)])))
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del examples
+    return current / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("corpus", nargs="?", default=str(DEFAULT_CORPUS))
+    parser.add_argument("--count", type=int, default=20000)
+    args = parser.parse_args()
+
+    with open(args.corpus, "r", encoding="utf-8") as f:
+        lines = [line for line in f if line.strip()]
+
+    # Text fields are the same in both layouts; report them separately so the
+    # structural overhead is visible
+    text_bytes = measure(lines, args.count, lambda r: (r["instruction"], r["input"], r["output"]))
+    legacy = measure(lines, args.count, build_legacy)
+    compact = measure(lines, args.count, build_compact)
+
+    print(f"examples:            {args.count}")
+    print(f"text only:           {text_bytes:10.1f} bytes/example")
+    print(f"legacy dict-based:   {legacy:10.1f} bytes/example ({legacy - text_bytes:.1f} overhead)")
+    print(f"slotted compact:     {compact:10.1f} bytes/example ({compact - text_bytes:.1f} overhead)")
+    print(f"overhead reduction:  {(legacy - text_bytes) / max(compact - text_bytes, 1):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+اختبار محلل قوالب التعليمات
+Prompt Template Lexer Test
+
+Runs extract_template_literals over a TypeScript fixture covering comments,
+quoted backticks, nested templates, ${...} substitutions and the escape
+sequences TypeScript cooks (\\xHH, \\uHHHH, \\u{...}, line continuations),
+with LF, CRLF and CR line endings, and checks every exported literal. Run
+it after touching the lexer:
+
+    python lib/training-prompt-lexer-test.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from training_system import extract_template_literals  # noqa: E402
+
+FIXTURE = r"""
+// export const COMMENTED = `not a literal`
+/* export const BLOCK = `not a literal either` */
+const quoted = 'a ` in quotes' + "and ` here";
+export const PLAIN = `Hello`;
+export const TYPED: string = `Escaped \` backtick and \${not} a substitution`;
+export const NESTED = `Outer ${cond ? `inner ${x}` : '}'} done`;
+export const INLINED = `${PLAIN}, world`;
+export const SIMPLE_ESCAPES = `a\nb\tc\\d\0e\'f\q`;
+export const HEX = `\x41\x7a`;
+export const UNICODE = `\u0041\u00e9\u{1F600}\u{41}`;
+export const CONTINUED = `one \
+two \
+three`;
+export const MULTILINE = `first
+second`;
+export const AFTER_ALL = `still found`;
+"""
+
+EXPECTED = {
+    'PLAIN': 'Hello',
+    'TYPED': 'Escaped ` backtick and ${not} a substitution',
+    'NESTED': "Outer ${cond ? `inner ${x}` : '}'} done",
+    'INLINED': 'Hello, world',
+    'SIMPLE_ESCAPES': "a\nb\tc\\d\0e'fq",
+    'HEX': 'Az',
+    'UNICODE': 'Aé\U0001F600A',
+    'CONTINUED': 'one two three',
+    'MULTILINE': 'first\nsecond',
+    'AFTER_ALL': 'still found',
+}
+
+
+def main() -> int:
+    # Line breaks inside literals cook to LF whatever the file's line endings
+    cases = [('LF', FIXTURE), ('CRLF', FIXTURE.replace('\n', '\r\n')), ('CR', FIXTURE.replace('\n', '\r'))]
+    failures = 0
+    for label, source in cases:
+        literals = extract_template_literals(source)
+        for name, expected in EXPECTED.items():
+            actual = literals.get(name)
+            if actual != expected:
+                failures += 1
+                print(f"FAIL {label} {name}: {actual!r} != {expected!r}", file=sys.stderr)
+        for name in sorted(set(literals) - set(EXPECTED)):
+            failures += 1
+            print(f"FAIL {label} {name}: not an exported literal", file=sys.stderr)
+    print(f"{len(EXPECTED) * len(cases)} literals checked, {failures} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
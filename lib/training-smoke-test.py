@@ -0,0 +1,199 @@
+"""
+اختبار سريع لواجهة نظام التدريب
+Training System API Smoke Test
+
+Calls every public AdvancedAITrainingSystem method once on a handful of
+examples, in a temporary directory, and fails if one raises or if a public
+method has no check here. Run it after moving code between modules:
+
+    python lib/training-smoke-test.py
+"""
+
+import inspect
+import json
+import os
+import sys
+import tempfile
+import traceback
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from training_system import AdvancedAITrainingSystem, PackedCorpusReader  # noqa: E402
+
+RESPONSE = """# Summary
+Quantum error correction improved in 2024 [peer:1:2024] and [news:2:2025].
+- Logical qubits [tech:3] [85% confidence]
+- Benchmarks [data:4:2024] [analysis:5]
+Conclusion: steady progress.
+"""
+SOURCES = [
+    {'type': 'peer', 'number': 1, 'year': 2024, 'title': 'Error correction', 'credibility_score': 0.95},
+    {'type': 'news', 'number': 2, 'year': 2025, 'title': 'Industry report'},
+]
+
+# Citations as found in older corpora: missing number, explicit nulls, other key orders
+SPARSE_SOURCES = [
+    {'type': 'peer'},
+    {'number': 2, 'type': 'news', 'year': None},
+    {'type': 'tech', 'number': 3, 'url': None, 'publisher': 'ACM', 'title': 'Qubits'},
+]
+
+
+def build(system: AdvancedAITrainingSystem, count: int = 4):
+    for i in range(count):
+        example = system.prepare_training_example(f"Question {i}?", RESPONSE + f"Variant {i}.", SOURCES, 8.5 + i / 10)
+        system.add_training_example(example)
+
+
+def checks(tmp: str):
+    """(method name, check) pairs; each check calls that method"""
+    def path(name: str) -> str:
+        # Checks shared by several methods run more than once; each run
+        # gets fresh files
+        return os.path.join(tempfile.mkdtemp(dir=tmp), name)
+
+    system = AdvancedAITrainingSystem()
+    build(system)
+
+    def streamed():
+        other = AdvancedAITrainingSystem()
+        other.open_training_stream(path('stream.jsonl'))
+        build(other)
+        assert other.close_training_stream() == 4
+
+    def loaded():
+        exported = path('all.jsonl')
+        system.export_training_jsonl(exported)
+        assert len(list(system.iter_training_jsonl(exported))) == 4
+        assert AdvancedAITrainingSystem().load_training_jsonl(exported) == 4
+        # Sparse and null source dicts come back exactly as given
+        record = {'instruction': 'Q?', 'input': '', 'output': RESPONSE, 'metadata': {'sources': SPARSE_SOURCES}}
+        sparse = path('sparse.jsonl')
+        with open(sparse, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        other = AdvancedAITrainingSystem()
+        other.load_training_jsonl(sparse)
+        other.export_training_jsonl(exported)
+        with open(sparse, 'rb') as expected, open(exported, 'rb') as actual:
+            assert actual.read() == expected.read()
+
+    def deduped():
+        other = AdvancedAITrainingSystem()
+        seen = path('seen.bloom')
+        other.enable_exact_dedupe(capacity=1000, path=seen)
+        other.enable_near_dedupe()
+        build(other)
+        build(other)
+        assert other.exact_duplicate_count == 4
+        other.save_exact_dedupe()
+        assert os.path.exists(seen)
+
+    def scored():
+        other = AdvancedAITrainingSystem()
+        other.enable_score_cache(path('scores.db'))
+        assert other.score_response(RESPONSE) == other.score_response(RESPONSE)
+        other.close_score_cache()
+
+    def stored():
+        other = AdvancedAITrainingSystem()
+        store = other.enable_example_store(path('examples.db'))
+        build(other)
+        assert store.count(min_quality=8.6) == 3
+        # Corpus methods default to the store's examples, not the empty list
+        assert other.plan_sequence_packing()['num_examples'] == 4
+        assert other.generate_fine_tuning_config()['steps_per_epoch']
+        packed = path('stored.pack')
+        other.export_training_packed(packed)
+        with PackedCorpusReader(packed) as reader:
+            assert len(reader) == 4
+        assert other.export_training_shards(path('stored'), workers=1)['total_examples'] == 4
+        other.close_example_store()
+
+    def instrumented():
+        other = AdvancedAITrainingSystem()
+        other.enable_instrumentation()
+        build(other)
+        assert other.disable_instrumentation()['methods']
+        other.enable_instrumentation()
+        build(other)
+        assert other.dump_instrumentation(path('metrics.json'))['methods']
+
+    def merged():
+        other = AdvancedAITrainingSystem()
+        other.validate_quality(RESPONSE)
+        system.merge_quality_metrics(other)
+
+    def packed():
+        system.plan_sequence_packing(max_seq_length=2048)
+        # Long examples passed in are measured themselves, not training_examples
+        long = [system.prepare_training_example(f"Long {i}?", RESPONSE * 100, SOURCES, 9.0) for i in range(3)]
+        plan = system.plan_sequence_packing(examples=long)
+        assert plan['max_seq_length'] == system.generate_fine_tuning_config(long)['max_seq_length']
+        assert not plan['oversized']
+
+    features = system.analyze_response(RESPONSE)
+    return [
+        ('prepare_training_example', lambda: build(AdvancedAITrainingSystem())),
+        ('add_training_example', lambda: build(AdvancedAITrainingSystem())),
+        ('analyze_response', lambda: system.analyze_response(RESPONSE)),
+        ('count_citations', lambda: system.count_citations(RESPONSE)),
+        ('check_citations', lambda: system.check_citations(features)),
+        ('check_coverage', lambda: system.check_coverage(features)),
+        ('check_readability', lambda: system.check_readability(features)),
+        ('check_source_quality', lambda: system.check_source_quality(features)),
+        ('check_relevance', lambda: system.check_relevance(features)),
+        ('score_response', lambda: system.score_response(RESPONSE)),
+        ('validate_quality', lambda: system.validate_quality(RESPONSE)),
+        ('validate_quality_batch', lambda: system.validate_quality_batch([RESPONSE] * 3, workers=2, min_parallel=1)),
+        ('get_quality_statistics', system.get_quality_statistics),
+        ('get_cache_statistics', system.get_cache_statistics),
+        ('merge_quality_metrics', merged),
+        ('open_training_stream', streamed),
+        ('close_training_stream', streamed),
+        ('export_training_jsonl', loaded),
+        ('iter_training_jsonl', loaded),
+        ('load_training_jsonl', loaded),
+        ('export_training_packed', lambda: system.export_training_packed(path('all.pack'))),
+        ('export_training_shards', lambda: system.export_training_shards(path('shards'), shard_size=2, workers=1)),
+        ('enable_exact_dedupe', deduped),
+        ('save_exact_dedupe', deduped),
+        ('enable_near_dedupe', deduped),
+        ('enable_score_cache', scored),
+        ('close_score_cache', scored),
+        ('enable_example_store', stored),
+        ('close_example_store', stored),
+        ('enable_instrumentation', instrumented),
+        ('disable_instrumentation', instrumented),
+        ('dump_instrumentation', instrumented),
+        ('plan_sequence_packing', packed),
+        ('generate_fine_tuning_config', system.generate_fine_tuning_config),
+        ('system_prompt', lambda: system.system_prompt),
+        ('system_prompt_tokens', lambda: system.system_prompt_tokens),
+    ]
+
+
+def main() -> int:
+    public = {
+        name for name, member in inspect.getmembers(AdvancedAITrainingSystem)
+        if not name.startswith('_') and (callable(member) or isinstance(member, property))
+    }
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        covered = set()
+        for name, check in checks(tmp):
+            covered.add(name)
+            try:
+                check()
+            except Exception:
+                failures += 1
+                print(f"FAIL {name}", file=sys.stderr)
+                traceback.print_exc()
+    for name in sorted(public - covered):
+        failures += 1
+        print(f"FAIL {name}: no smoke check", file=sys.stderr)
+    print(f"{len(covered & public)} methods checked, {failures} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
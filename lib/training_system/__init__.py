@@ -0,0 +1,106 @@
+"""
+نظام تدريب الذكاء الاصطناعي المتقدم جداً
+Ultra Enhanced AI Training System
+
+Submodules are imported lazily (PEP 562): ``import training_system`` is
+nearly free, and each attribute pulls in only the submodule defining it.
+
+    from training_system import AdvancedAITrainingSystem
+
+The command-line interface is ``python -m training_system --help``.
+"""
+
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    # analysis
+    'SOURCE_TYPES': 'analysis',
+    'QUALITY_METRICS': 'analysis',
+    'ResponseFeatures': 'analysis',
+    'analyze_response': 'analysis',
+    'normalize_words': 'analysis',
+    'estimate_tokens': 'analysis',
+    'detect_language': 'analysis',
+    'AnalysisCache': 'analysis',
+    # examples
+    'Source': 'examples',
+    'ExampleMetadata': 'examples',
+    'TrainingExample': 'examples',
+    'example_token_count': 'examples',
+    'example_to_json': 'examples',
+    'example_from_dict': 'examples',
+    'dedupe_key': 'examples',
+    # jsonl
+    'iter_training_jsonl': 'jsonl',
+    'index_path_for': 'jsonl',
+    'build_jsonl_index': 'jsonl',
+    'JsonlSink': 'jsonl',
+    'IndexedJsonlReader': 'jsonl',
+    # packed
+    'PACKED_HAS_QUALITY': 'packed',
+    'PACKED_QUALITY_IS_INT': 'packed',
+    'PACKED_HAS_CITATIONS': 'packed',
+    'PACKED_HAS_WORDS': 'packed',
+    'PACKED_HAS_SOURCE_TYPES': 'packed',
+    'PackedRecord': 'packed',
+    'write_packed_corpus': 'packed',
+    'PackedCorpusReader': 'packed',
+    # stats
+    'REPORTED_QUANTILES': 'stats',
+    'KLLSketch': 'stats',
+    'MetricSeries': 'stats',
+    'plan_sequence_packing': 'stats',
+    'corpus_length_stats': 'stats',
+    # dedupe
+    'NearDuplicateIndex': 'dedupe',
+    'NEAR_DUPLICATE_ACTIONS': 'dedupe',
+    'BloomFilter': 'dedupe',
+    # shards
+    'SHARD_COMPRESSION': 'shards',
+    'verify_training_shards': 'shards',
+    # prompts
+    'SYSTEM_PROMPT_FILE': 'prompts',
+    'SYSTEM_PROMPT_NAME': 'prompts',
+    'DEFAULT_SYSTEM_PROMPT': 'prompts',
+    'PROMPT_DIRECTORY': 'prompts',
+    'PromptTemplate': 'prompts',
+    'extract_template_literals': 'prompts',
+    'system_prompt_path': 'prompts',
+    'load_prompt_file': 'prompts',
+    'load_prompt_library': 'prompts',
+    'system_prompt_template': 'prompts',
+    'load_system_prompt': 'prompts',
+    # instrumentation
+    'INSTRUMENTED_METHODS': 'instrumentation',
+    'Instrumentation': 'instrumentation',
+    # system
+    'AdvancedAITrainingSystem': 'system',
+    'RUBRIC_VERSION': 'system',
+    # score_cache
+    'ScoreCache': 'score_cache',
+    # store
+    'ExampleStore': 'store',
+    # pipeline
+    'IngestionPipeline': 'pipeline',
+    'ingest': 'pipeline',
+}
+_SUBMODULES = frozenset(_EXPORTS.values()) | {'generator', 'cli'}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f'.{name}', __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | _SUBMODULES)
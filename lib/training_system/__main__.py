@@ -0,0 +1,7 @@
+"""python -m training_system: see training_system.cli"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,192 @@
+"""Response analysis: rubric token patterns, ResponseFeatures and the analysis cache"""
+
+import hashlib
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+
+SOURCE_TYPES: Tuple[str, ...] = ('peer', 'news', 'tech', 'analysis', 'data')
+QUALITY_METRICS: Tuple[str, ...] = ('accuracy', 'completeness', 'clarity', 'sources', 'relevance')
+
+
+# Bracketed tokens the rubric looks at: citations ([type:N] / [type:N:YYYY],
+# plus unterminated [type:N for source-type counts) and [NN% confidence] markers
+_TOKEN_PATTERN = re.compile(
+    r'\[(?:(?P<type>peer|news|tech|analysis|data):\d+(?P<closed>(?::\d{4})?\])?'
+    r'|(?P<confidence>\d+(?:\.\d+)?)%\s+confidence\])'
+)
+# Markdown headings and list items at the start of a line; anchored on the
+# newline rather than ^ so the scan can use a literal prefix search
+_LINE_START_PATTERN = re.compile(r'\n(?:(?P<heading>#+)|[-*])(?=\s)')
+_FIRST_LINE_PATTERN = re.compile(r'(?:(?P<heading>#+)|[-*])(?=\s)')
+
+# Arabic diacritics (tashkeel), superscript alef and tatweel carry no meaning
+# for duplicate detection; alef/ya/ta marbuta variants are folded together
+_ARABIC_MARKS_PATTERN = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u0640]')
+_ARABIC_FOLD = str.maketrans({'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا', 'ى': 'ي', 'ة': 'ه'})
+_WORD_PATTERN = re.compile(r'\w+')
+# detect_language counts letters on the UTF-8 bytes: deleting every other
+# byte leaves one byte per ASCII letter, or one lead byte per character of
+# U+0600-U+06FF and U+0740-U+077F (Arabic and Arabic Supplement)
+_NOT_LATIN_BYTES = bytes(b for b in range(256) if not (0x41 <= b <= 0x5a or 0x61 <= b <= 0x7a))
+_NOT_ARABIC_LEAD_BYTES = bytes(b for b in range(256) if b not in (0xd8, 0xd9, 0xda, 0xdb, 0xdd))
+
+
+@dataclass
+class ResponseFeatures:
+    """Rubric and metadata features extracted from one response"""
+    word_count: int
+    citation_count: int
+    source_types: Dict[str, int]
+    confidence_levels: List[float] = field(default_factory=list)
+    heading_count: int = 0
+    list_item_count: int = 0
+    sentence_count: int = 1
+    sentence_word_total: int = 0
+    has_conclusion: bool = False
+
+    @property
+    def avg_sentence_length(self) -> float:
+        """Average words per '.'-delimited sentence"""
+        return self.sentence_word_total / self.sentence_count
+
+    @property
+    def unique_source_types(self) -> int:
+        """Number of source types cited at least once"""
+        return sum(1 for count in self.source_types.values() if count > 0)
+
+
+def analyze_response(text: str) -> ResponseFeatures:
+    """Analyze a response once for everything the rubric and metadata need"""
+    source_types = dict.fromkeys(SOURCE_TYPES, 0)
+    confidence_levels: List[float] = []
+    citation_count = 0
+
+    for source_type, closed, confidence in _TOKEN_PATTERN.findall(text):
+        if source_type:
+            source_types[source_type] += 1
+            if closed:
+                citation_count += 1
+        else:
+            confidence_levels.append(float(confidence))
+
+    # Each match yields its heading marks, or '' for a list item
+    line_starts = _LINE_START_PATTERN.findall(text)
+    first_line = _FIRST_LINE_PATTERN.match(text)
+    if first_line is not None:
+        line_starts.append(first_line.group('heading') or '')
+    list_item_count = line_starts.count('')
+    heading_count = len(line_starts) - list_item_count
+
+    word_count = len(text.split())
+    # Sentences are '.'-delimited; words split by a '.' count once per side
+    sentence_count = text.count('.') + 1
+    if sentence_count > 1:
+        sentence_word_total = len(text.replace('.', ' ').split())
+    else:
+        sentence_word_total = word_count
+
+    has_conclusion = 'conclusion' in text or 'summary' in text or 'خاتمة' in text
+    if not has_conclusion:
+        lowered = text.lower()
+        has_conclusion = 'conclusion' in lowered or 'summary' in lowered
+
+    return ResponseFeatures(
+        word_count=word_count,
+        citation_count=citation_count,
+        source_types=source_types,
+        confidence_levels=confidence_levels,
+        heading_count=heading_count,
+        list_item_count=list_item_count,
+        sentence_count=sentence_count,
+        sentence_word_total=sentence_word_total,
+        has_conclusion=has_conclusion
+    )
+
+
+def normalize_words(text: str) -> List[str]:
+    """Case-folded words with Arabic diacritics and letter variants normalized"""
+    text = _ARABIC_MARKS_PATTERN.sub('', text.casefold()).translate(_ARABIC_FOLD)
+    return _WORD_PATTERN.findall(text)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough tokenizer-free token estimate
+    
+    About 4 characters per token for ASCII (English, code, markdown) and 2 for
+    other scripts such as Arabic, which BPE vocabularies split more finely.
+    """
+    if text.isascii():
+        return -(-len(text) // 4)
+    ascii_chars = len(text.encode('ascii', 'ignore'))
+    return -(-ascii_chars // 4) + -(-(len(text) - ascii_chars) // 2)
+
+
+def detect_language(text: str) -> str:
+    """'ar' or 'en', whichever script has more letters in text ('' if neither)
+    
+    Citation markers such as [peer:1:2023] count as Latin, which only
+    matters for responses that are mostly markup.
+    """
+    data = text.encode('utf-8')
+    latin = len(data.translate(None, _NOT_LATIN_BYTES))
+    if len(data) != len(text) and len(data.translate(None, _NOT_ARABIC_LEAD_BYTES)) > latin:
+        return 'ar'
+    return 'en' if latin else ''
+
+
+class AnalysisCache:
+    """Bounded LRU cache of ResponseFeatures keyed by a hash of the response text"""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, ResponseFeatures]" = OrderedDict()
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        """Content hash used as cache key"""
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def get(self, text: str) -> ResponseFeatures:
+        """Return cached features for text, analyzing it on a miss"""
+        if self.maxsize <= 0:
+            self.misses += 1
+            return analyze_response(text)
+
+        key = self.key(text)
+        features = self._entries.get(key)
+        if features is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return features
+
+        self.misses += 1
+        features = analyze_response(text)
+        self._entries[key] = features
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return features
+
+    def clear(self):
+        """Drop all entries and reset counters"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and current fill"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._entries),
+            'maxsize': self.maxsize
+        }
@@ -0,0 +1,605 @@
+"""
+Streaming command-line interface: generate, validate, export, ingest, index, query and stats
+
+Every subcommand reads and writes JSONL one record at a time, from files
+(.gz and .xz are decompressed on the fly) or stdin/stdout ('-'), so corpora
+are never loaded whole. Progress and summaries go to stderr and --quiet
+silences them; stdout carries only data.
+
+    python -m training_system generate --count 1000000 --seed 1 > corpus.jsonl
+    python -m training_system validate corpus.jsonl --workers 4 --score-cache scores.db > scores.jsonl
+    python -m training_system ingest drops/*.jsonl -o corpus.jsonl --workers 4
+    python -m training_system export corpus.jsonl --min-quality 8 --source-type peer -o best.jsonl
+    python -m training_system index corpus.jsonl --store corpus.db --workers 4
+    python -m training_system query corpus.db --language ar --min-quality 9 --min-source peer=3 -o best.jsonl
+    zcat shard-*.jsonl.gz | python -m training_system stats --rescore
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from contextlib import nullcontext
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .analysis import QUALITY_METRICS, SOURCE_TYPES, estimate_tokens
+from .jsonl import open_input, open_output
+from .stats import MetricSeries
+from .system import AdvancedAITrainingSystem, _init_scoring_worker, _score_chunk
+
+PROGRESS_INTERVAL = 100_000
+
+
+_TEXT_FIELDS = ('instruction', 'input', 'output')
+_NUMERIC_METADATA = ('quality_score', 'citations_count', 'word_count')
+_JSON_TYPES = {str: 'string', int: 'number', float: 'number', bool: 'boolean', list: 'array', dict: 'object'}
+
+
+def _json_type(value) -> str:
+    return 'null' if value is None else _JSON_TYPES.get(type(value), type(value).__name__)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _record_problem(record) -> Optional[str]:
+    """Why a parsed line is not a record the commands can use, or None"""
+    if not isinstance(record, dict):
+        return f"expected a JSON object, got {_json_type(record)}"
+    for key in _TEXT_FIELDS:
+        if key in record and not isinstance(record[key], str):
+            return f"{key} must be a string, got {_json_type(record[key])}"
+    metadata = record.get('metadata')
+    if metadata is None:
+        return None
+    if not isinstance(metadata, dict):
+        return f"metadata must be an object, got {_json_type(metadata)}"
+    for key in _NUMERIC_METADATA:
+        value = metadata.get(key)
+        if value is not None and not _is_number(value):
+            return f"metadata.{key} must be a number, got {_json_type(value)}"
+    source_types = metadata.get('source_types')
+    if source_types is not None and not (
+        isinstance(source_types, dict) and all(_is_number(count) for count in source_types.values())
+    ):
+        return "metadata.source_types must be an object of counts"
+    sources = metadata.get('sources')
+    if sources is not None and not (isinstance(sources, list) and all(isinstance(source, dict) for source in sources)):
+        return "metadata.sources must be an array of objects"
+    return None
+
+
+def iter_records(paths: Iterable[str]) -> Iterator[Tuple[bytes, Dict]]:
+    """(raw line, parsed record) for every non-blank line of every input
+
+    An unreadable input, a line that is not JSON or a record with wrongly
+    typed fields (texts must be strings, metadata scores and counts
+    numbers) stops the command with file:line on stderr (SystemExit), not
+    a traceback.
+    """
+    for path in paths:
+        name = '<stdin>' if path == '-' else path
+        try:
+            f = open_input(path)
+        except OSError as error:
+            raise SystemExit(f"{name}: {error.strerror or error}") from None
+        try:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as error:
+                    message = f"invalid JSON: {error.msg} at column {error.pos + 1}"
+                    raise SystemExit(f"{name}:{line_number}: {message}") from None
+                except ValueError as error:
+                    raise SystemExit(f"{name}:{line_number}: invalid JSON: {error}") from None
+                problem = _record_problem(record)
+                if problem is not None:
+                    raise SystemExit(f"{name}:{line_number}: {problem}")
+                yield line, record
+        except (OSError, EOFError) as error:
+            # Corrupt or truncated .gz/.xz input
+            raise SystemExit(f"{name}: {getattr(error, 'strerror', None) or error}") from None
+        finally:
+            if f is not sys.stdin.buffer:
+                f.close()
+
+
+def score_texts(
+    texts: Iterable[str],
+    workers: int = 1,
+    chunk_size: int = 1000,
+    score_cache: Optional[str] = None
+) -> Iterator[Tuple[float, ...]]:
+    """Rubric scores in QUALITY_METRICS order, one tuple per text, in input order
+
+    With workers > 1 texts are scored in chunks across a process pool with at
+    most two chunks in flight per worker, so memory stays bounded however
+    long the input is. With score_cache (an SQLite path) each chunk is looked
+    up first and only new or edited texts are scored.
+    """
+    system = AdvancedAITrainingSystem(keep_metric_values=False)
+    cache = None
+    if score_cache:
+        from .score_cache import ScoreCache
+        cache = ScoreCache(score_cache, system.rubric_version)
+    executor = None
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_scoring_worker,
+            initargs=(type(system),)
+        )
+
+    def finish(chunk, rows, scored):
+        if not isinstance(scored, list):
+            scored = scored.result()
+        scored = iter(scored)
+        for text, row in zip(chunk, rows):
+            if row is None:
+                row = next(scored)
+                if cache is not None:
+                    cache.put(text, row)
+            yield row
+
+    texts = iter(texts)
+    pending = deque()
+    in_flight = workers * 2 if executor is not None else 0
+    try:
+        while True:
+            chunk = list(islice(texts, chunk_size))
+            if not chunk:
+                break
+            rows = cache.get_many(chunk) if cache is not None else [None] * len(chunk)
+            misses = [text for text, row in zip(chunk, rows) if row is None]
+            if executor is not None and misses:
+                scored = executor.submit(_score_chunk, misses)
+            else:
+                scored = [
+                    tuple(scores[metric] for metric in QUALITY_METRICS)
+                    for scores in map(system.score_response, misses)
+                ]
+            pending.append((chunk, rows, scored))
+            while len(pending) > in_flight:
+                yield from finish(*pending.popleft())
+        while pending:
+            yield from finish(*pending.popleft())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if cache is not None:
+            cache.close()
+
+
+class _Progress:
+    """Record counter that reports to stderr every PROGRESS_INTERVAL records"""
+
+    def __init__(self, label: str, quiet: bool):
+        self.label = label
+        self.quiet = quiet
+        self.count = 0
+
+    def tick(self):
+        self.count += 1
+        if not self.quiet and self.count % PROGRESS_INTERVAL == 0:
+            print(f"{self.label}: {self.count} records", file=sys.stderr)
+
+
+def _log(args, message: str):
+    if not args.quiet:
+        print(message, file=sys.stderr)
+
+
+def _record_tokens(record: Dict, overhead: int) -> int:
+    """Same estimate as example_token_count, on a parsed record"""
+    return (
+        estimate_tokens(record.get('instruction', ''))
+        + estimate_tokens(record.get('input', ''))
+        + estimate_tokens(record.get('output', ''))
+        + overhead
+    )
+
+
+def cmd_generate(args) -> int:
+    from .generator import iter_synthetic_examples
+    from .examples import example_to_json
+
+    system = AdvancedAITrainingSystem(keep_metric_values=False)
+    examples = iter_synthetic_examples(
+        system,
+        args.count,
+        seed=args.seed,
+        mean_words=args.mean_words,
+        length_sigma=args.length_sigma,
+        citation_density=args.citation_density,
+        structure=args.structure,
+        duplicate_rate=args.duplicate_rate,
+        arabic_ratio=args.arabic_ratio
+    )
+    progress = _Progress('generate', args.quiet)
+    out = open_output(args.output)
+    try:
+        for example in examples:
+            out.write((example_to_json(example) + '\n').encode('utf-8'))
+            progress.tick()
+    finally:
+        out.flush()
+        if out is not sys.stdout.buffer:
+            out.close()
+    _log(args, f"Generated {progress.count} examples to {args.output}")
+    return 0
+
+
+def cmd_validate(args) -> int:
+    metrics = {metric: MetricSeries(keep_values=False, sketch_k=200) for metric in QUALITY_METRICS}
+    texts = (record.get('output', '') for _, record in iter_records(args.inputs))
+    progress = _Progress('validate', args.quiet)
+    below = 0
+    out = open_output(args.output)
+    try:
+        for line_number, row in enumerate(score_texts(texts, args.workers, args.chunk_size, args.score_cache), 1):
+            scores = dict(zip(QUALITY_METRICS, row))
+            overall = sum(row) / len(row)
+            for metric, value in scores.items():
+                metrics[metric].append(value)
+            if args.fail_under is not None and overall < args.fail_under:
+                below += 1
+            scores['overall'] = round(overall, 4)
+            out.write(json.dumps({'line': line_number, **scores}).encode('utf-8') + b'\n')
+            progress.tick()
+    finally:
+        out.flush()
+        if out is not sys.stdout.buffer:
+            out.close()
+
+    if not args.quiet:
+        print(f"Validated {progress.count} examples", file=sys.stderr)
+        for metric, series in metrics.items():
+            if series.count:
+                stats = series.stats()
+                print(f"  {metric}: {stats['mean']:.2f} (min: {stats['min']:.2f}, max: {stats['max']:.2f}, "
+                      f"p50: {stats['p50']:.2f})", file=sys.stderr)
+    if below:
+        _log(args, f"{below} examples scored below {args.fail_under}")
+        return 1
+    return 0
+
+
+def _export_filter(args):
+    """Predicate over parsed records built from the export options"""
+    required_types = args.source_type or []
+
+    def keep(record: Dict) -> bool:
+        metadata = record.get('metadata') or {}
+        if args.min_quality is not None and (metadata.get('quality_score') or 0) < args.min_quality:
+            return False
+        if args.min_citations is not None and (metadata.get('citations_count') or 0) < args.min_citations:
+            return False
+        words = metadata.get('word_count')
+        if words is None and (args.min_words is not None or args.max_words is not None):
+            words = len(record.get('output', '').split())
+        if args.min_words is not None and words < args.min_words:
+            return False
+        if args.max_words is not None and words > args.max_words:
+            return False
+        if required_types:
+            source_types = metadata.get('source_types') or {}
+            if any(not source_types.get(source_type) for source_type in required_types):
+                return False
+        return True
+
+    return keep
+
+
+def cmd_export(args) -> int:
+    keep = _export_filter(args)
+    seen = None
+    if args.dedupe:
+        from .dedupe import BloomFilter
+        from .examples import example_from_dict, dedupe_key
+        seen = BloomFilter(args.dedupe_capacity, 0.001)
+
+    records = islice(iter_records(args.inputs), args.skip, None)
+    progress = _Progress('export', args.quiet)
+    written = duplicates = 0
+    out = open_output(args.output)
+    try:
+        for line, record in records:
+            progress.tick()
+            if not keep(record):
+                continue
+            if seen is not None and not seen.add(dedupe_key(example_from_dict(record))):
+                duplicates += 1
+                continue
+            # Matching records are copied byte for byte, not re-serialized
+            out.write(line if line.endswith(b'\n') else line + b'\n')
+            written += 1
+            if args.limit is not None and written >= args.limit:
+                break
+    finally:
+        out.flush()
+        if out is not sys.stdout.buffer:
+            out.close()
+    message = f"Exported {written} of {progress.count} examples to {args.output}"
+    if seen is not None:
+        message += f" ({duplicates} duplicates dropped)"
+    _log(args, message)
+    return 0
+
+
+def cmd_ingest(args) -> int:
+    from .pipeline import ingest
+
+    if args.output == '-':
+        raise SystemExit("ingest needs an output file (-o)")
+    system = AdvancedAITrainingSystem(keep_metric_values=False)
+    if args.dedupe:
+        system.enable_exact_dedupe(capacity=args.dedupe_capacity)
+    # Lines that are not valid candidates are counted as invalid, but an
+    # unreadable input stops the run
+    try:
+        stats = ingest(
+            args.inputs,
+            args.output,
+            system=system,
+            workers=args.workers,
+            batch_size=args.chunk_size,
+            queue_size=args.queue_size,
+            ordered=not args.unordered,
+            append=args.append
+        )
+    except OSError as error:
+        raise SystemExit(str(error)) from None
+    if not args.quiet:
+        print(json.dumps(stats, indent=2), file=sys.stderr)
+    return 0
+
+
+def cmd_index(args) -> int:
+    from .store import ExampleStore
+
+    pending = deque()
+
+    def outputs() -> Iterator[str]:
+        # Records wait here until their scores come back, a bounded number at a time
+        for line, record in iter_records(args.inputs):
+            pending.append((line, record))
+            yield record.get('output', '')
+
+    progress = _Progress('index', args.quiet)
+    with ExampleStore(args.store) as store:
+        # Loading into an empty store builds the indexes once at the end;
+        # appending to a large one updates them row by row instead
+        loading = store.bulk_load() if not len(store) else nullcontext()
+        with loading:
+            for row in score_texts(outputs(), args.workers, args.chunk_size, args.score_cache):
+                line, record = pending.popleft()
+                store.add_record(line, record.get('metadata') or {}, record.get('output', ''), row)
+                progress.tick()
+        total = len(store)
+    _log(args, f"Indexed {progress.count} examples into {args.store} ({total} stored)")
+    return 0
+
+
+def _store_filters(args) -> Dict:
+    """ExampleStore filter keywords from the query options"""
+    filters = {
+        'min_quality': args.min_quality,
+        'max_quality': args.max_quality,
+        'min_citations': args.min_citations,
+        'min_words': args.min_words,
+        'max_words': args.max_words,
+        'language': args.language
+    }
+    filters = {name: value for name, value in filters.items() if value is not None}
+    if args.min_score:
+        filters['min_scores'] = dict(args.min_score)
+    if args.min_source:
+        filters['min_source_types'] = dict(args.min_source)
+    return filters
+
+
+def _assignment(cast, choices):
+    """argparse type for NAME=VALUE options"""
+
+    def parse(text: str) -> Tuple[str, float]:
+        name, separator, value = text.partition('=')
+        if not separator or name not in choices:
+            raise argparse.ArgumentTypeError(f"expected NAME=VALUE with NAME one of {', '.join(choices)}")
+        try:
+            return name, cast(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid value {value!r}") from None
+
+    return parse
+
+
+def cmd_query(args) -> int:
+    from .store import ExampleStore
+
+    if not os.path.exists(args.store):
+        raise SystemExit(f"no such store: {args.store}")
+    filters = _store_filters(args)
+    with ExampleStore(args.store) as store:
+        if args.count:
+            print(store.count(**filters))
+            return 0
+        try:
+            lines = store.iter_lines(order_by=args.order_by, limit=args.limit, **filters)
+        except ValueError as error:
+            raise SystemExit(str(error)) from None
+        written = 0
+        out = open_output(args.output)
+        try:
+            for line in lines:
+                out.write(line + b'\n')
+                written += 1
+        finally:
+            out.flush()
+            if out is not sys.stdout.buffer:
+                out.close()
+    _log(args, f"Exported {written} examples to {args.output}")
+    return 0
+
+
+def cmd_stats(args) -> int:
+    series = {
+        name: MetricSeries(keep_values=False, sketch_k=400)
+        for name in ('tokens', 'quality_score', 'citations_count', 'word_count')
+    }
+    source_types = dict.fromkeys(SOURCE_TYPES, 0)
+    # Exact, unlike a total rebuilt from the running mean
+    total_tokens = 0
+    progress = _Progress('stats', args.quiet)
+
+    def outputs() -> Iterator[str]:
+        # Per-record statistics are gathered as the texts stream past
+        nonlocal total_tokens
+        for _, record in iter_records(args.inputs):
+            progress.tick()
+            metadata = record.get('metadata') or {}
+            tokens = _record_tokens(record, args.example_overhead)
+            total_tokens += tokens
+            series['tokens'].append(tokens)
+            for name in ('quality_score', 'citations_count', 'word_count'):
+                value = metadata.get(name)
+                if value is not None:
+                    series[name].append(value)
+            for source_type, count in (metadata.get('source_types') or {}).items():
+                source_types[source_type] = source_types.get(source_type, 0) + count
+            yield record.get('output', '')
+
+    rubric = {metric: MetricSeries(keep_values=False, sketch_k=200) for metric in QUALITY_METRICS}
+    if args.rescore:
+        for row in score_texts(outputs(), args.workers, args.chunk_size, args.score_cache):
+            for metric, value in zip(QUALITY_METRICS, row):
+                rubric[metric].append(value)
+    else:
+        for _ in outputs():
+            pass
+
+    report = {
+        'examples': progress.count,
+        'total_tokens': total_tokens,
+    }
+    for name, values in series.items():
+        if values.count:
+            report[name] = values.stats()
+    report['source_types'] = source_types
+    if args.rescore:
+        report['rubric'] = {metric: values.stats() for metric, values in rubric.items() if values.count}
+
+    out = open_output(args.output)
+    try:
+        out.write(json.dumps(report, ensure_ascii=False, indent=None if args.compact else 2).encode('utf-8') + b'\n')
+    finally:
+        out.flush()
+        if out is not sys.stdout.buffer:
+            out.close()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m training_system',
+        description="Stream, validate, filter and summarize training-data JSONL"
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('-o', '--output', default='-', help="output file, '-' for stdout (default)")
+    common.add_argument('-q', '--quiet', action='store_true', help="no progress or summary on stderr")
+    inputs = argparse.ArgumentParser(add_help=False)
+    inputs.add_argument('inputs', nargs='*', default=['-'], metavar='INPUT',
+                        help="JSONL files (.gz/.xz ok), '-' for stdin (default)")
+    scoring = argparse.ArgumentParser(add_help=False)
+    scoring.add_argument('--workers', type=int, default=1, help="scoring processes (default 1)")
+    scoring.add_argument('--chunk-size', type=int, default=1000, help="responses per worker task")
+    score_cache = argparse.ArgumentParser(add_help=False)
+    score_cache.add_argument('--score-cache', metavar='PATH',
+                             help="SQLite file of persisted scores; only new or edited responses are scored")
+
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser('generate', parents=[common], help="write seeded synthetic examples")
+    generate.add_argument('--count', type=int, required=True)
+    generate.add_argument('--seed', type=int, default=0)
+    generate.add_argument('--mean-words', type=int, default=250)
+    generate.add_argument('--length-sigma', type=float, default=0.5)
+    generate.add_argument('--citation-density', type=float, default=1.0, help="expected citations per 100 words")
+    generate.add_argument('--structure', type=float, default=0.7, help="0-1, amount of headings, lists and conclusions")
+    generate.add_argument('--duplicate-rate', type=float, default=0.0)
+    generate.add_argument('--arabic-ratio', type=float, default=0.5)
+    generate.set_defaults(handler=cmd_generate)
+
+    validate = commands.add_parser('validate', parents=[inputs, common, scoring, score_cache],
+                                   help="score every response against the rubric")
+    validate.add_argument('--fail-under', type=float, metavar='SCORE',
+                          help="exit with status 1 if any example's mean score is below SCORE")
+    validate.set_defaults(handler=cmd_validate)
+
+    export = commands.add_parser('export', parents=[inputs, common], help="copy the records matching filters")
+    export.add_argument('--min-quality', type=float)
+    export.add_argument('--min-citations', type=int)
+    export.add_argument('--min-words', type=int)
+    export.add_argument('--max-words', type=int)
+    export.add_argument('--source-type', action='append', choices=SOURCE_TYPES,
+                        help="require at least one citation of this type (repeatable)")
+    export.add_argument('--dedupe', action='store_true', help="drop exact duplicates (Bloom filter)")
+    export.add_argument('--dedupe-capacity', type=int, default=10_000_000)
+    export.add_argument('--skip', type=int, default=0, help="records to skip before filtering")
+    export.add_argument('--limit', type=int, help="stop after writing this many records")
+    export.set_defaults(handler=cmd_export)
+
+    ingest = commands.add_parser('ingest', parents=[inputs, common, scoring],
+                                 help="prepare and score candidate files concurrently into one corpus")
+    ingest.add_argument('--queue-size', type=int, default=8, help="batches buffered between stages")
+    ingest.add_argument('--unordered', action='store_true', help="write batches as soon as they are scored")
+    ingest.add_argument('--append', action='store_true', help="append to the output instead of replacing it")
+    ingest.add_argument('--dedupe', action='store_true', help="drop exact duplicates (Bloom filter)")
+    ingest.add_argument('--dedupe-capacity', type=int, default=10_000_000)
+    ingest.set_defaults(handler=cmd_ingest)
+
+    index = commands.add_parser('index', parents=[inputs, common, scoring, score_cache],
+                                help="score records and add them to an indexed SQLite store")
+    index.add_argument('--store', required=True, metavar='PATH', help="SQLite store (created if missing)")
+    index.set_defaults(handler=cmd_index)
+
+    query = commands.add_parser('query', parents=[common], help="stream the stored records matching filters")
+    query.add_argument('store', metavar='STORE', help="SQLite store written by index")
+    query.add_argument('--min-quality', type=float)
+    query.add_argument('--max-quality', type=float)
+    query.add_argument('--min-citations', type=int)
+    query.add_argument('--min-words', type=int)
+    query.add_argument('--max-words', type=int)
+    query.add_argument('--language', help="'ar' or 'en'")
+    query.add_argument('--min-score', action='append', metavar='METRIC=SCORE',
+                       type=_assignment(float, QUALITY_METRICS), help="minimum rubric score (repeatable)")
+    query.add_argument('--min-source', action='append', metavar='TYPE=N',
+                       type=_assignment(int, SOURCE_TYPES), help="minimum citations of a source type (repeatable)")
+    query.add_argument('--order-by', default='id',
+                       help="id (insertion order, default), a filter column, or --order-by=-column for descending")
+    query.add_argument('--limit', type=int)
+    query.add_argument('--count', action='store_true', help="print the number of matches instead")
+    query.set_defaults(handler=cmd_query)
+
+    stats = commands.add_parser('stats', parents=[inputs, common, scoring, score_cache], help="corpus statistics as JSON")
+    stats.add_argument('--rescore', action='store_true', help="also score every response against the rubric")
+    stats.add_argument('--example-overhead', type=int, default=4, help="template tokens added per example")
+    stats.add_argument('--compact', action='store_true', help="single-line JSON")
+    stats.set_defaults(handler=cmd_stats)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except BrokenPipeError:
+        # Downstream closed the pipe (e.g. `| head`); not an error. Point
+        # stdout at devnull so the interpreter's final flush does not fail
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
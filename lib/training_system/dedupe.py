@@ -0,0 +1,206 @@
+"""Exact (Bloom filter) and near-duplicate (MinHash/LSH) detection"""
+
+import hashlib
+import math
+import os
+import struct
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .analysis import normalize_words
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index for near-duplicate texts
+    
+    Signatures use one-permutation MinHash over word shingles (each shingle is
+    hashed once into one of num_perm bins, empty bins are densified by
+    rotation), so signing costs O(words) rather than O(words * num_perm).
+    Bands of the signature are bucketed so a lookup only compares against
+    texts sharing a bucket; candidates are confirmed by estimated Jaccard.
+    """
+    
+    _MASK = 0xFFFFFFFF
+    # Odd constant used to derive values for densified (empty) bins
+    _ROTATION = 0x9E3779B1
+    
+    def __init__(self, threshold: float = 0.85, num_perm: int = 128, shingle_size: int = 3):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = self._choose_bands(threshold, num_perm)
+        self._buckets: List[Dict[int, Union[int, List[int]]]] = [{} for _ in range(self.bands)]
+        self._signatures = array('I')
+        self.count = 0
+    
+    @staticmethod
+    def _choose_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+        # Largest rows-per-band whose LSH threshold (1/b)^(1/r) stays at or
+        # below the target, so true matches are rarely missed; false
+        # candidates are removed by the Jaccard check
+        best = (num_perm, 1)
+        for rows in range(1, num_perm + 1):
+            if num_perm % rows:
+                continue
+            bands = num_perm // rows
+            if (1 / bands) ** (1 / rows) <= threshold:
+                best = (bands, rows)
+        return best
+    
+    def signature(self, text: str) -> Optional[array]:
+        """MinHash signature of a text, or None if it has no words"""
+        words = normalize_words(text)
+        if not words:
+            return None
+        size = self.shingle_size
+        if len(words) <= size:
+            shingles = [' '.join(words)]
+        else:
+            shingles = [' '.join(words[i:i + size]) for i in range(len(words) - size + 1)]
+        
+        num_perm = self.num_perm
+        empty = self._MASK + 1
+        bins = [empty] * num_perm
+        for shingle in set(shingles):
+            value = int.from_bytes(
+                hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little'
+            )
+            slot = value % num_perm
+            value = (value // num_perm) & self._MASK
+            if value < bins[slot]:
+                bins[slot] = value
+        
+        if empty in bins:
+            # Densify: an empty bin borrows from the next filled bin to its right
+            filled = [i for i, value in enumerate(bins) if value != empty]
+            for i in range(num_perm):
+                if bins[i] == empty:
+                    j = next((k for k in filled if k > i), filled[0])
+                    distance = (j - i) % num_perm
+                    bins[i] = (bins[j] + distance * self._ROTATION) & self._MASK
+        return array('I', bins)
+    
+    def _band_keys(self, signature: array) -> List[int]:
+        rows = self.rows
+        return [hash(signature[i:i + rows].tobytes()) for i in range(0, self.num_perm, rows)]
+    
+    def similarity(self, signature: array, doc_id: int) -> float:
+        """Estimated Jaccard similarity between a signature and an indexed text"""
+        start = doc_id * self.num_perm
+        stored = self._signatures[start:start + self.num_perm]
+        return sum(1 for a, b in zip(signature, stored) if a == b) / self.num_perm
+    
+    def query(self, signature: array) -> Optional[Tuple[int, float]]:
+        """Best indexed match at or above the threshold as (doc_id, similarity)"""
+        seen = set()
+        best = None
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            if bucket is None:
+                continue
+            for doc_id in (bucket,) if isinstance(bucket, int) else bucket:
+                if doc_id in seen:
+                    continue
+                seen.add(doc_id)
+                score = self.similarity(signature, doc_id)
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (doc_id, score)
+        return best
+    
+    def add(self, signature: array) -> int:
+        """Index a signature and return its doc id"""
+        doc_id = self.count
+        self._signatures.extend(signature)
+        for band, key in enumerate(self._band_keys(signature)):
+            buckets = self._buckets[band]
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = doc_id
+            elif isinstance(bucket, int):
+                buckets[key] = [bucket, doc_id]
+            else:
+                bucket.append(doc_id)
+        self.count += 1
+        return doc_id
+    
+    def __len__(self) -> int:
+        return self.count
+
+
+NEAR_DUPLICATE_ACTIONS = ('reject', 'tag', 'count')
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings with a target false-positive rate
+    
+    Memory is set by capacity and error_rate up front and does not grow;
+    past capacity the false-positive rate rises above error_rate.
+    """
+    
+    _HEADER = struct.Struct('<8sQQQQ')
+    _MAGIC = b'TSBLOOM1'
+    
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, key: str) -> Iterator[int]:
+        # Kirsch-Mitzenmacher double hashing from one 128-bit digest
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+    
+    def add(self, key: str) -> bool:
+        """Add a key; returns False if it was (probably) already present"""
+        bits = self.bits
+        new = False
+        for position in self._positions(key):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+    
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def save(self, path: str):
+        """Write the filter to disk (written to a temp file, then renamed)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self._HEADER.pack(self._MAGIC, self.capacity, self.num_bits, self.num_hashes, self.count))
+            f.write(struct.pack('<d', self.error_rate))
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter":
+        """Read a filter written by save()"""
+        with open(path, 'rb') as f:
+            magic, capacity, num_bits, num_hashes, count = cls._HEADER.unpack(f.read(cls._HEADER.size))
+            if magic != cls._MAGIC:
+                raise ValueError(f"{path} is not a Bloom filter file")
+            (error_rate,) = struct.unpack('<d', f.read(8))
+            bits = bytearray(f.read())
+        if len(bits) != (num_bits + 7) // 8:
+            raise ValueError(f"{path} is truncated")
+        bloom = cls.__new__(cls)
+        bloom.capacity = capacity
+        bloom.error_rate = error_rate
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom.bits = bits
+        bloom.count = count
+        return bloom
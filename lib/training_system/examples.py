@@ -0,0 +1,210 @@
+"""Training example records: Source, ExampleMetadata, TrainingExample"""
+
+import json
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple, Union
+
+from .analysis import SOURCE_TYPES, estimate_tokens, normalize_words
+
+
+@dataclass(slots=True)
+class Source:
+    """Source citation structure"""
+    type: str  # peer, news, tech, analysis, data
+    number: int
+    year: Optional[int] = None
+    title: Optional[str] = None
+    url: Optional[str] = None
+    credibility_score: Optional[float] = None
+    extra: Optional[Dict] = None  # keys outside the fixed fields, kept for round-trips
+    # Keys of the dict this source was read from, in order (one shared tuple
+    # per key layout), so to_dict writes back exactly the keys it was given
+    keys: Optional[Tuple[str, ...]] = field(default=None, compare=False, repr=False)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Source":
+        """Build a source from a citation dict, interning the type string"""
+        source_type = data.get('type')
+        extra = {key: value for key, value in data.items() if key not in _SOURCE_FIELDS}
+        keys = tuple(data)
+        return cls(
+            type=sys.intern(source_type) if isinstance(source_type, str) else source_type,
+            number=data.get('number'),
+            year=data.get('year'),
+            title=data.get('title'),
+            url=data.get('url'),
+            credibility_score=data.get('credibility_score'),
+            extra=extra or None,
+            keys=_SOURCE_KEY_LAYOUTS.setdefault(keys, keys)
+        )
+
+    def to_dict(self) -> Dict:
+        """Citation dict in the JSONL schema
+        
+        A source read with from_dict gets back the keys it had, nulls
+        included, in their original order; fields set since are added after
+        them. Otherwise type and number are written and unset optional
+        fields are omitted.
+        """
+        extra = self.extra or {}
+        if self.keys is None:
+            data = {'type': self.type, 'number': self.number}
+        else:
+            data = {
+                key: getattr(self, key) if key in _SOURCE_FIELDS else extra[key]
+                for key in self.keys
+                if key in _SOURCE_FIELDS or key in extra
+            }
+        for key in _SOURCE_OPTIONAL_FIELDS:
+            value = getattr(self, key)
+            if value is not None and key not in data:
+                data[key] = value
+        for key, value in extra.items():
+            if key not in data:
+                data[key] = value
+        return data
+
+
+_SOURCE_OPTIONAL_FIELDS = ('year', 'title', 'url', 'credibility_score')
+_SOURCE_FIELDS = frozenset(('type', 'number') + _SOURCE_OPTIONAL_FIELDS)
+_SOURCE_KEY_LAYOUTS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+@dataclass(slots=True)
+class ExampleMetadata:
+    """Fixed-field metadata of a training example
+    
+    Serializes to the same metadata dict as the JSONL schema. Fields that are
+    None (e.g. after a projected read) are left out of the dict.
+    """
+    sources: Optional[Tuple[Source, ...]] = None
+    quality_score: Optional[float] = None
+    timestamp: Optional[str] = None
+    citations_count: Optional[int] = None
+    word_count: Optional[int] = None
+    # Counts in SOURCE_TYPES order; a dict only if a record used other types
+    source_types: Optional[Union[Tuple[int, ...], Dict[str, int]]] = None
+    confidence_levels: Optional[Tuple[float, ...]] = None
+    extra: Optional[Dict] = None  # keys outside the fixed fields, kept for round-trips
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ExampleMetadata":
+        """Build metadata from a JSONL metadata dict"""
+        sources = data.get('sources')
+        if sources is not None:
+            sources = tuple(
+                source if isinstance(source, Source) else Source.from_dict(source)
+                for source in sources
+            )
+        source_types = data.get('source_types')
+        if isinstance(source_types, dict) and tuple(source_types) == SOURCE_TYPES:
+            source_types = tuple(source_types.values())
+        confidence_levels = data.get('confidence_levels')
+        if confidence_levels is not None:
+            confidence_levels = tuple(confidence_levels)
+        extra = {key: value for key, value in data.items() if key not in _METADATA_FIELDS}
+        return cls(
+            sources=sources,
+            quality_score=data.get('quality_score'),
+            timestamp=data.get('timestamp'),
+            citations_count=data.get('citations_count'),
+            word_count=data.get('word_count'),
+            source_types=source_types,
+            confidence_levels=confidence_levels,
+            extra=extra or None
+        )
+
+    def _value(self, key: str):
+        value = getattr(self, key)
+        if value is None:
+            return None
+        if key == 'sources':
+            return [source.to_dict() for source in value]
+        if key == 'source_types' and isinstance(value, tuple):
+            return dict(zip(SOURCE_TYPES, value))
+        if key == 'confidence_levels':
+            return list(value)
+        return value
+
+    def to_dict(self) -> Dict:
+        """Metadata dict in the JSONL schema"""
+        data = {}
+        for key in _METADATA_FIELDS:
+            value = self._value(key)
+            if value is not None:
+                data[key] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __getitem__(self, key: str):
+        if key in _METADATA_FIELDS:
+            value = self._value(key)
+            if value is not None:
+                return value
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+
+_METADATA_FIELDS = (
+    'sources', 'quality_score', 'timestamp', 'citations_count',
+    'word_count', 'source_types', 'confidence_levels'
+)
+
+
+@dataclass(slots=True)
+class TrainingExample:
+    """Training example structure"""
+    instruction: str
+    input: str
+    output: str
+    metadata: ExampleMetadata
+
+    def __post_init__(self):
+        if isinstance(self.metadata, dict):
+            self.metadata = ExampleMetadata.from_dict(self.metadata)
+
+    def to_dict(self) -> Dict:
+        """Record in the JSONL schema"""
+        return {
+            'instruction': self.instruction,
+            'input': self.input,
+            'output': self.output,
+            'metadata': self.metadata.to_dict()
+        }
+
+
+def example_token_count(example: "TrainingExample", overhead: int = 4) -> int:
+    """Estimated tokens of one example including a fixed template/EOS overhead"""
+    return estimate_tokens(example.instruction) + estimate_tokens(example.input) + estimate_tokens(example.output) + overhead
+
+
+def example_to_json(example: TrainingExample) -> str:
+    """Serialize a training example as one JSONL line (without newline)"""
+    return json.dumps(example.to_dict(), ensure_ascii=False)
+
+
+def example_from_dict(record: Dict) -> TrainingExample:
+    """Build a training example from a parsed JSONL record"""
+    return TrainingExample(
+        instruction=record.get('instruction', ''),
+        input=record.get('input', ''),
+        output=record.get('output', ''),
+        metadata=record.get('metadata', {})
+    )
+
+
+def dedupe_key(example: TrainingExample) -> str:
+    """Normalized instruction/output pair used for exact-duplicate checks"""
+    return ' '.join(normalize_words(example.instruction)) + '\x1f' + ' '.join(normalize_words(example.output))
@@ -0,0 +1,551 @@
+"""
+مولد بيانات التدريب المحسّن
+Enhanced Training Data Generator
+"""
+
+import argparse
+import json
+import math
+import random
+from collections import deque
+from datetime import datetime, timedelta
+
+from .analysis import SOURCE_TYPES
+from .system import AdvancedAITrainingSystem
+
+
+def create_training_examples(seen_path=None, system=None):
+    """إنشاء أمثلة تدريب متنوعة"""
+    system = system or AdvancedAITrainingSystem()
+    if seen_path and system.seen_filter is None:
+        # تجاهل الأمثلة التي صُدّرت في تشغيلات سابقة
+        system.enable_exact_dedupe(path=seen_path)
+    
+    # ===== مثال 1: البرمجة (عربي) =====
+    example1 = system.prepare_training_example(
+        user_query="كيف أنشئ مكون React مع TypeScript؟",
+        response="""## إنشاء مكون React مع TypeScript
+
+لإنشاء مكون React مع TypeScript، اتبع الخطوات التالية:
+
+### 1. إعداد المشروع
+```tsx
+// components/MyComponent.tsx
+import React from 'react'
+
+interface MyComponentProps {
+  title: string
+  count?: number
+}
+
+export const MyComponent: React.FC<MyComponentProps> = ({ title, count = 0 }) => {
+  return (
+    <div>
+      <h1>{title}</h1>
+      <p>Count: {count}</p>
+    </div>
+  )
+}
+```
+
+### 2. المزايا الرئيسية
+- Type Safety: TypeScript يضمن نوع البيانات [tech:1:2024]
+- Better IDE Support: دعم أفضل في محررات الكود [tech:2:2024]
+- Refactoring: إعادة هيكلة أسهل وأكثر أماناً [analysis:1:2024]
+
+### 3. أفضل الممارسات
+- استخدم interfaces للـ props
+- حدد أنواع البيانات بوضوح
+- استخدم optional properties (?) عند الحاجة""",
+        sources=[
+            {"type": "tech", "number": 1, "year": 2024, "title": "TypeScript React Guide"},
+            {"type": "tech", "number": 2, "year": 2024, "title": "React TypeScript Best Practices"},
+            {"type": "analysis", "number": 1, "year": 2024, "title": "TypeScript Benefits Analysis"}
+        ],
+        quality_score=9.0
+    )
+    system.add_training_example(example1)
+    system.validate_quality(example1.output)
+    
+    # ===== مثال 2: العلوم (إنجليزي) =====
+    example2 = system.prepare_training_example(
+        user_query="What are the latest developments in quantum computing?",
+        response="""## Recent Quantum Computing Breakthroughs (Q4 2024 - Q1 2025)
+
+### Google's Willow Chip [news:1:2024]
+Google announced significant improvements in quantum error correction, achieving error rates below 0.1% [peer:1:2024]. This represents a major milestone in practical quantum computing.
+
+### IBM's Quantum Roadmap [tech:1:2024]
+IBM released their latest quantum processor with enhanced stability. The new architecture shows promise for commercial applications [tech:1:2024].
+
+### Error Correction Progress [peer:2:2025]
+Recent research demonstrates promising results in quantum error correction [peer:2:2025]. The breakthrough could enable fault-tolerant quantum computers within the next decade [analysis:1:2025].
+
+### Practical Timeline
+| Milestone | Timeline | Confidence |
+|-----------|----------|------------|
+| Error correction < 0.1% | 2024 | 95% |
+| 1000+ qubit systems | 2026 | 70% |
+| Commercial applications | 2028 | 50% |
+
+**Sources Ranked by Credibility:**
+- Peer-reviewed journal articles [peer:1][peer:2]
+- Company technical publications [tech:1]
+- News analysis with expert quotes [news:1][analysis:1]""",
+        sources=[
+            {"type": "news", "number": 1, "year": 2024, "title": "Google Quantum Announcement"},
+            {"type": "peer", "number": 1, "year": 2024, "title": "Quantum Error Correction Study"},
+            {"type": "tech", "number": 1, "year": 2024, "title": "IBM Quantum Roadmap"},
+            {"type": "peer", "number": 2, "year": 2025, "title": "Fault-Tolerant Quantum Computing"},
+            {"type": "analysis", "number": 1, "year": 2025, "title": "Quantum Computing Timeline"}
+        ],
+        quality_score=9.5
+    )
+    system.add_training_example(example2)
+    system.validate_quality(example2.output)
+    
+    # ===== مثال 3: الكتابة (عربي) =====
+    example3 = system.prepare_training_example(
+        user_query="كيف أحسّن أسلوب كتابتي؟",
+        response="""## طرق تحسين أسلوب الكتابة
+
+### 1. الوضوح والاختصار
+- استخدم جمل قصيرة وواضحة [analysis:1:2024]
+- تجنب الجمل المعقدة غير الضرورية
+- راجع كل جملة للتأكد من وضوحها
+
+### 2. التنوع في البنية
+- اخلط بين الجمل البسيطة والمركبة [peer:1:2024]
+- استخدم تراكيب مختلفة لتجنب الرتابة
+- تنوّع في طول الجمل
+
+### 3. اختيار الكلمات
+- اختر كلمات دقيقة ومعبرة [analysis:2:2024]
+- تجنب التكرار غير الضروري
+- استخدم قاموس ثري ومتنوع
+
+### 4. الممارسة المستمرة
+البحوث تظهر أن الكتابة اليومية تحسّن الأسلوب بنسبة 40% خلال 3 أشهر [peer:2:2024].
+
+### نصائح عملية
+1. اكتب يومياً لمدة 30 دقيقة على الأقل
+2. اقرأ أعمال كتّاب محترفين
+3. اطلب التغذية الراجعة من الآخرين""",
+        sources=[
+            {"type": "analysis", "number": 1, "year": 2024, "title": "Writing Clarity Guide"},
+            {"type": "peer", "number": 1, "year": 2024, "title": "Sentence Structure Research"},
+            {"type": "analysis", "number": 2, "year": 2024, "title": "Word Choice Analysis"},
+            {"type": "peer", "number": 2, "year": 2024, "title": "Writing Practice Study"}
+        ],
+        quality_score=8.5
+    )
+    system.add_training_example(example3)
+    system.validate_quality(example3.output)
+    
+    # ===== مثال 4: الأكاديمي (إنجليزي) =====
+    example4 = system.prepare_training_example(
+        user_query="Explain the theory of relativity in academic terms",
+        response="""## Theory of Relativity: Academic Overview
+
+### Special Relativity (1905)
+Einstein's special theory of relativity revolutionized physics by introducing the constancy of the speed of light [peer:1:1905]. The theory posits that:
+
+1. **Postulate of Relativity**: Physical laws are identical in all inertial frames [peer:1:1905]
+2. **Constancy of Light Speed**: Light speed is constant regardless of observer motion [peer:2:1905]
+
+### General Relativity (1915)
+General relativity extends special relativity to include gravity through the equivalence principle [peer:3:1915]. Key concepts include:
+
+- **Spacetime Curvature**: Mass-energy curves spacetime [peer:3:1915]
+- **Gravitational Waves**: Predicted in 1916, confirmed in 2015 [news:1:2015]
+- **Black Holes**: Solutions to Einstein's field equations [peer:4:1916]
+
+### Experimental Validation
+Multiple experiments confirm relativity predictions [peer:5:2019]:
+- Gravitational lensing observations [data:1:2020]
+- GPS satellite corrections [tech:1:2020]
+- LIGO gravitational wave detections [peer:6:2016]
+
+**Academic Sources:**
+- Einstein's original papers [peer:1:1905][peer:3:1915]
+- Modern reviews and textbooks [peer:5:2019]
+- Experimental confirmations [peer:6:2016][data:1:2020]""",
+        sources=[
+            {"type": "peer", "number": 1, "year": 1905, "title": "Einstein Special Relativity"},
+            {"type": "peer", "number": 2, "year": 1905, "title": "Light Speed Constancy"},
+            {"type": "peer", "number": 3, "year": 1915, "title": "Einstein General Relativity"},
+            {"type": "peer", "number": 4, "year": 1916, "title": "Schwarzschild Solution"},
+            {"type": "peer", "number": 5, "year": 2019, "title": "Relativity Review"},
+            {"type": "peer", "number": 6, "year": 2016, "title": "LIGO Detection"},
+            {"type": "news", "number": 1, "year": 2015, "title": "Gravitational Waves Discovery"},
+            {"type": "data", "number": 1, "year": 2020, "title": "Gravitational Lensing Data"},
+            {"type": "tech", "number": 1, "year": 2020, "title": "GPS Relativity Corrections"}
+        ],
+        quality_score=9.8
+    )
+    system.add_training_example(example4)
+    system.validate_quality(example4.output)
+    
+    # ===== مثال 5: البرمجة (إنجليزي) =====
+    example5 = system.prepare_training_example(
+        user_query="How do I implement authentication in Next.js?",
+        response="""## Implementing Authentication in Next.js
+
+### 1. NextAuth.js Setup [tech:1:2024]
+NextAuth.js is the recommended solution for Next.js authentication [tech:1:2024].
+
+```typescript
+// app/api/auth/[...nextauth]/route.ts
+import NextAuth from 'next-auth'
+import GoogleProvider from 'next-auth/providers/google'
+
+export const authOptions = {
+  providers: [
+    GoogleProvider({
+      clientId: process.env.GOOGLE_CLIENT_ID!,
+      clientSecret: process.env.GOOGLE_CLIENT_SECRET!,
+    }),
+  ],
+}
+
+export default NextAuth(authOptions)
+```
+
+### 2. Session Management
+- Server-side: Use `getServerSession()` [tech:2:2024]
+- Client-side: Use `useSession()` hook [tech:2:2024]
+- Middleware protection for routes [tech:3:2024]
+
+### 3. Security Best Practices
+Research shows that 70% of security breaches involve authentication issues [analysis:1:2024]:
+- Always use HTTPS in production [tech:4:2024]
+- Implement CSRF protection [peer:1:2024]
+- Use secure session storage [tech:4:2024]
+
+### 4. Database Integration
+Store user sessions securely [tech:5:2024]:
+- Recommended: PostgreSQL or MongoDB
+- Use encrypted session tokens
+- Implement session expiration""",
+        sources=[
+            {"type": "tech", "number": 1, "year": 2024, "title": "NextAuth.js Documentation"},
+            {"type": "tech", "number": 2, "year": 2024, "title": "Next.js Session Management"},
+            {"type": "tech", "number": 3, "year": 2024, "title": "Next.js Middleware"},
+            {"type": "tech", "number": 4, "year": 2024, "title": "Web Security Best Practices"},
+            {"type": "tech", "number": 5, "year": 2024, "title": "Database Session Storage"},
+            {"type": "analysis", "number": 1, "year": 2024, "title": "Security Breach Analysis"},
+            {"type": "peer", "number": 1, "year": 2024, "title": "CSRF Protection Research"}
+        ],
+        quality_score=9.2
+    )
+    system.add_training_example(example5)
+    system.validate_quality(example5.output)
+    
+    # ===== مثال 6: العلوم (عربي) =====
+    example6 = system.prepare_training_example(
+        user_query="ما هو الذكاء الاصطناعي وكيف يعمل؟",
+        response="""## الذكاء الاصطناعي: نظرة شاملة
+
+### التعريف
+الذكاء الاصطناعي (AI) هو قدرة الآلات على محاكاة الذكاء البشري [peer:1:2024]. يتضمن التعلم والاستدلال واتخاذ القرارات.
+
+### أنواع الذكاء الاصطناعي
+1. **الذكاء الاصطناعي الضيق (Narrow AI)**: متخصص في مهام محددة [tech:1:2024]
+2. **الذكاء الاصطناعي العام (AGI)**: هدف مستقبلي للذكاء الشامل [analysis:1:2024]
+
+### كيف يعمل؟
+#### 1. التعلم الآلي (Machine Learning)
+- الخوارزميات تتعلم من البيانات [peer:2:2024]
+- تحسين الأداء مع المزيد من البيانات [tech:2:2024]
+
+#### 2. الشبكات العصبية
+- محاكاة بنية الدماغ البشري [peer:3:2024]
+- طبقات متعددة للمعالجة [tech:3:2024]
+
+#### 3. التعلم العميق (Deep Learning)
+- شبكات عصبية عميقة [peer:4:2024]
+- معالجة البيانات المعقدة [analysis:2:2024]
+
+### التطبيقات الحالية
+- التعرف على الصور: دقة تصل إلى 95% [news:1:2024]
+- معالجة اللغة الطبيعية: ChatGPT و Claude [tech:4:2024]
+- السيارات ذاتية القيادة: في مرحلة التطوير [news:2:2024]
+
+**المصادر:**
+- أوراق أكاديمية [peer:1][peer:2][peer:3][peer:4]
+- وثائق تقنية [tech:1][tech:2][tech:3][tech:4]
+- تحليلات خبراء [analysis:1][analysis:2]
+- أخبار حديثة [news:1][news:2]""",
+        sources=[
+            {"type": "peer", "number": 1, "year": 2024, "title": "AI Definition Research"},
+            {"type": "tech", "number": 1, "year": 2024, "title": "Narrow AI Guide"},
+            {"type": "analysis", "number": 1, "year": 2024, "title": "AGI Analysis"},
+            {"type": "peer", "number": 2, "year": 2024, "title": "Machine Learning Study"},
+            {"type": "tech", "number": 2, "year": 2024, "title": "ML Best Practices"},
+            {"type": "peer", "number": 3, "year": 2024, "title": "Neural Networks Research"},
+            {"type": "tech", "number": 3, "year": 2024, "title": "Neural Network Architecture"},
+            {"type": "peer", "number": 4, "year": 2024, "title": "Deep Learning Study"},
+            {"type": "analysis", "number": 2, "year": 2024, "title": "Deep Learning Applications"},
+            {"type": "news", "number": 1, "year": 2024, "title": "Image Recognition Breakthrough"},
+            {"type": "tech", "number": 4, "year": 2024, "title": "NLP Models"},
+            {"type": "news", "number": 2, "year": 2024, "title": "Autonomous Vehicles"}
+        ],
+        quality_score=9.3
+    )
+    system.add_training_example(example6)
+    system.validate_quality(example6.output)
+    
+    return system
+
+# ===== توليد بيانات اصطناعية قابلة للتوسع =====
+# Synthetic corpus generation for load testing: seeded, deterministic and
+# streamed, so corpora of any size never sit in memory.
+
+SYNTHETIC_VOCABULARY = {
+    "ar": (
+        "الذكاء الاصطناعي البيانات النموذج التعلم الشبكات العصبية الخوارزمية التدريب "
+        "الدقة الأداء التحليل البحث المصادر النتائج التطبيقات البرمجة الأنظمة الحديثة "
+        "المعالجة اللغة الطبيعية التقنية المستخدم الجودة الاختبار التحسين الأمان "
+        "التطوير المشروع الواجهة الخادم قاعدة السرعة الكفاءة الدراسة التجربة القياس"
+    ).split(),
+    "en": (
+        "model data training accuracy performance analysis research source results "
+        "application system network neural algorithm language processing quality test "
+        "security deployment latency throughput benchmark evaluation dataset pipeline "
+        "framework interface server database cache memory inference optimization study"
+    ).split(),
+}
+SYNTHETIC_QUESTIONS = {
+    "ar": ["ما هو {}؟", "كيف يعمل {}؟", "اشرح {} بالتفصيل", "ما أفضل الممارسات في {}؟"],
+    "en": ["What is {}?", "How does {} work?", "Explain {} in detail", "What are best practices for {}?"],
+}
+SYNTHETIC_CONCLUSION = {"ar": "## خاتمة", "en": "## Summary"}
+SYNTHETIC_SOURCE_TYPES = SOURCE_TYPES
+SYNTHETIC_EPOCH = datetime(2025, 1, 1)
+
+
+def _synthetic_sentence(rng, vocabulary, words, citation_probability):
+    """جملة عشوائية مع استشهاد اختياري"""
+    sentence = " ".join(rng.choices(vocabulary, k=words))
+    if rng.random() < citation_probability:
+        source_type = rng.choice(SYNTHETIC_SOURCE_TYPES)
+        sentence += f" [{source_type}:{rng.randint(1, 9)}:{rng.randint(2015, 2025)}]"
+    return sentence + "."
+
+
+def _synthetic_response(rng, language, target_words, citation_density, structure):
+    """رد بصيغة markdown بطول وبنية وكثافة استشهاد محددة"""
+    vocabulary = SYNTHETIC_VOCABULARY[language]
+    # citation_density is citations per 100 words; sentences average ~15 words
+    citation_probability = min(1.0, citation_density * 15 / 100)
+    lines = []
+    if rng.random() < structure:
+        lines.append("## " + " ".join(rng.choices(vocabulary, k=4)))
+    written = 0
+    while written < target_words:
+        if rng.random() < structure / 3:
+            lines.append("\n### " + " ".join(rng.choices(vocabulary, k=3)))
+        if rng.random() < structure / 2:
+            for _ in range(rng.randint(2, 4)):
+                words = rng.randint(4, 10)
+                lines.append("- " + _synthetic_sentence(rng, vocabulary, words, citation_probability))
+                written += words
+        else:
+            words = rng.randint(8, 22)
+            lines.append(_synthetic_sentence(rng, vocabulary, words, citation_probability))
+            written += words
+    if rng.random() < structure / 2:
+        lines.append("\n" + SYNTHETIC_CONCLUSION[language])
+        lines.append(_synthetic_sentence(rng, vocabulary, rng.randint(8, 16), citation_probability))
+    return "\n".join(lines)
+
+
+def iter_synthetic_examples(
+    system,
+    count,
+    seed=0,
+    mean_words=250,
+    length_sigma=0.5,
+    citation_density=1.0,
+    structure=0.7,
+    duplicate_rate=0.0,
+    arabic_ratio=0.5
+):
+    """توليد أمثلة تدريب اصطناعية بشكل متدفق وحتمي
+    
+    Yields count examples prepared by system. Lengths follow a log-normal
+    distribution with the given mean (in words), citation_density is the
+    expected citations per 100 words, structure (0-1) controls headings,
+    lists and conclusions, and duplicate_rate is the share of examples that
+    exactly repeat one of the last 1000 generated. Same seed, same corpus.
+    """
+    rng = random.Random(seed)
+    mu = math.log(mean_words) - length_sigma ** 2 / 2
+    recent = deque(maxlen=1000)
+    for i in range(count):
+        timestamp = (SYNTHETIC_EPOCH + timedelta(seconds=i)).isoformat()
+        if recent and rng.random() < duplicate_rate:
+            query, response, sources, quality = rng.choice(recent)
+        else:
+            language = "ar" if rng.random() < arabic_ratio else "en"
+            topic = " ".join(rng.choices(SYNTHETIC_VOCABULARY[language], k=2))
+            query = rng.choice(SYNTHETIC_QUESTIONS[language]).format(topic)
+            target_words = max(10, int(rng.lognormvariate(mu, length_sigma)))
+            response = _synthetic_response(rng, language, target_words, citation_density, structure)
+            sources = [
+                {"type": rng.choice(SYNTHETIC_SOURCE_TYPES), "number": n + 1, "year": rng.randint(2015, 2025)}
+                for n in range(rng.randint(1, 5))
+            ]
+            scores = system.score_response(response)
+            quality = round(sum(scores.values()) / len(scores), 2)
+            recent.append((query, response, sources, quality))
+        yield system.prepare_training_example(
+            user_query=query,
+            response=response,
+            sources=sources,
+            quality_score=quality,
+            timestamp=timestamp
+        )
+
+
+def generate_synthetic_corpus(
+    output_file,
+    count,
+    seen_path=None,
+    flush_interval=1000,
+    system=None,
+    seen_capacity=None,
+    seen_error_rate=0.001,
+    **options
+):
+    """كتابة مجموعة بيانات اصطناعية مباشرة إلى ملف JSONL متدفق"""
+    # Only running statistics are kept, so memory stays flat for any count
+    system = system or AdvancedAITrainingSystem(keep_metric_values=False)
+    if seen_path and system.seen_filter is None:
+        # A new filter is sized for this run; a loaded one must have room for it
+        system.enable_exact_dedupe(
+            capacity=seen_capacity or count,
+            error_rate=seen_error_rate,
+            path=seen_path,
+            expected=count
+        )
+    with system.open_training_stream(output_file, append=bool(seen_path), flush_interval=flush_interval):
+        for example in iter_synthetic_examples(system, count, **options):
+            system.validate_quality(example.output)
+            system.add_training_example(example)
+    if seen_path:
+        system.save_exact_dedupe()
+    return system
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="Enhanced Training Data Generator")
+    parser.add_argument("--output", default="training_data_enhanced.jsonl")
+    parser.add_argument(
+        "--seen",
+        help="Bloom filter file of already exported examples; new examples are appended to --output"
+    )
+    parser.add_argument(
+        "--seen-capacity",
+        type=int,
+        help="examples a new --seen filter is sized for, across all the runs that will share it "
+             "(default: 1000000, or N with --synthetic)"
+    )
+    parser.add_argument("--seen-error-rate", type=float, default=0.001,
+                        help="false-positive rate of a new --seen filter at capacity")
+    synthetic = parser.add_argument_group("synthetic corpus")
+    synthetic.add_argument("--synthetic", type=int, metavar="N",
+                           help="stream N seeded synthetic examples to --output instead")
+    synthetic.add_argument("--seed", type=int, default=0)
+    synthetic.add_argument("--mean-words", type=int, default=250)
+    synthetic.add_argument("--length-sigma", type=float, default=0.5)
+    synthetic.add_argument("--citation-density", type=float, default=1.0,
+                           help="expected citations per 100 words")
+    synthetic.add_argument("--structure", type=float, default=0.7,
+                           help="0-1, amount of headings, lists and conclusions")
+    synthetic.add_argument("--duplicate-rate", type=float, default=0.0)
+    synthetic.add_argument("--arabic-ratio", type=float, default=0.5)
+    instrumentation = parser.add_argument_group("instrumentation")
+    instrumentation.add_argument("--metrics", metavar="PATH",
+                                 help="write per-method timers and counters to PATH as JSON")
+    instrumentation.add_argument("--profile", action="store_true",
+                                 help="include cProfile hot spots in --metrics")
+    instrumentation.add_argument("--trace-memory", action="store_true",
+                                 help="include tracemalloc peak and top allocations in --metrics")
+    args = parser.parse_args(argv)
+    
+    system = AdvancedAITrainingSystem(keep_metric_values=args.synthetic is None)
+    if args.metrics:
+        system.enable_instrumentation(profile=args.profile, trace_memory=args.trace_memory)
+    if args.seen:
+        expected = args.synthetic or 0
+        try:
+            system.enable_exact_dedupe(
+                capacity=args.seen_capacity or expected or 1_000_000,
+                error_rate=args.seen_error_rate,
+                path=args.seen,
+                expected=expected
+            )
+        except ValueError as error:
+            parser.error(f"{error} (a new --seen file with --seen-capacity)")
+    
+    if args.synthetic is not None:
+        print(f"🧪 توليد {args.synthetic} مثال اصطناعي إلى {args.output}...")
+        generate_synthetic_corpus(
+            args.output,
+            args.synthetic,
+            seen_path=args.seen,
+            system=system,
+            seed=args.seed,
+            mean_words=args.mean_words,
+            length_sigma=args.length_sigma,
+            citation_density=args.citation_density,
+            structure=args.structure,
+            duplicate_rate=args.duplicate_rate,
+            arabic_ratio=args.arabic_ratio
+        )
+        for metric, values in system.get_quality_statistics().items():
+            print(f"  {metric}: {values['mean']:.2f} (min: {values['min']:.2f}, max: {values['max']:.2f})")
+        if args.metrics:
+            system.dump_instrumentation(args.metrics)
+            print(f"📈 تم حفظ مقاييس الأداء في: {args.metrics}")
+        return
+    
+    print("🚀 بدء إنشاء بيانات التدريب المحسّنة...")
+    print("=" * 60)
+    
+    system = create_training_examples(seen_path=args.seen, system=system)
+    
+    # طباعة الإحصائيات
+    print(f"\n✅ تم إنشاء {len(system.training_examples)} أمثلة تدريب")
+    
+    # التحقق من الجودة
+    print("\n📊 إحصائيات الجودة:")
+    stats = system.get_quality_statistics()
+    for metric, values in stats.items():
+        print(f"  {metric}: {values['mean']:.2f} (min: {values['min']:.2f}, max: {values['max']:.2f})")
+    
+    # تصدير البيانات
+    output_file = args.output
+    system.export_training_jsonl(output_file, append=bool(args.seen))
+    if args.seen:
+        system.save_exact_dedupe()
+        print(f"  ⏭️  تم تجاهل {system.exact_duplicate_count} أمثلة مكررة")
+    
+    print(f"\n💾 تم تصدير البيانات إلى: {output_file}")
+    
+    # طباعة تكوين Fine-Tuning
+    print("\n⚙️  تكوين Fine-Tuning:")
+    config = system.generate_fine_tuning_config()
+    print(json.dumps(config, indent=2))
+    
+    if args.metrics:
+        system.dump_instrumentation(args.metrics)
+        print(f"\n📈 تم حفظ مقاييس الأداء في: {args.metrics}")
+    
+    print("\n✨ اكتمل إنشاء بيانات التدريب!")
+
+if __name__ == "__main__":
+    main()
+
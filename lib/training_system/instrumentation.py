@@ -0,0 +1,132 @@
+"""Opt-in per-method timers with optional cProfile/tracemalloc capture"""
+
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+# Methods wrapped by AdvancedAITrainingSystem.enable_instrumentation(). Times
+# are inclusive: score_response includes the check_* calls it makes
+INSTRUMENTED_METHODS: Tuple[str, ...] = (
+    'prepare_training_example',
+    'add_training_example',
+    'analyze_response',
+    'validate_quality',
+    'validate_quality_batch',
+    'score_response',
+    'check_citations',
+    'check_coverage',
+    'check_readability',
+    'check_source_quality',
+    'check_relevance',
+    'export_training_jsonl',
+    'export_training_packed',
+    'export_training_shards'
+)
+
+
+class Instrumentation:
+    """Per-method call counters and timers, with optional cProfile/tracemalloc capture
+    
+    Timers cost two perf_counter calls per wrapped call; nothing is wrapped
+    unless instrumentation is enabled.
+    """
+    
+    def __init__(self, profile: bool = False, trace_memory: bool = False, profile_limit: int = 30):
+        # name -> [calls, total seconds, max seconds]
+        self.timers: Dict[str, List[float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.profile_limit = profile_limit
+        self.profiler = None
+        self.trace_memory = trace_memory
+        self.started = time.perf_counter()
+        self.stopped: Optional[float] = None
+        self._profile_stats: Optional[List[Dict]] = None
+        self._memory: Optional[Dict] = None
+        if profile:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        if trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+    
+    def wrap(self, name: str, method):
+        """Return method wrapped with a call counter and timer"""
+        timer = self.timers.setdefault(name, [0, 0.0, 0.0])
+        clock = time.perf_counter
+        
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                timer[0] += 1
+                timer[1] += elapsed
+                if elapsed > timer[2]:
+                    timer[2] = elapsed
+        
+        timed.__wrapped__ = method
+        timed.__name__ = getattr(method, '__name__', name)
+        timed.__doc__ = getattr(method, '__doc__', None)
+        return timed
+    
+    def stop(self):
+        """Stop profiling and memory tracing; timers and counters stay readable"""
+        if self.stopped is not None:
+            return
+        self.stopped = time.perf_counter()
+        if self.profiler is not None:
+            import pstats
+            self.profiler.disable()
+            rows = sorted(
+                pstats.Stats(self.profiler).stats.items(),
+                key=lambda item: item[1][3],
+                reverse=True
+            )[:self.profile_limit]
+            self._profile_stats = [
+                {
+                    'function': f"{os.path.basename(filename)}:{line}({name})",
+                    'calls': calls,
+                    'total_seconds': total,
+                    'cumulative_seconds': cumulative
+                }
+                for (filename, line, name), (_, calls, total, cumulative, _) in rows
+            ]
+        if self.trace_memory:
+            import tracemalloc
+            current, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics('lineno')[:self.profile_limit]
+            tracemalloc.stop()
+            self._memory = {
+                'current_bytes': current,
+                'peak_bytes': peak,
+                'top_allocations': [
+                    {'location': str(stat.traceback), 'bytes': stat.size, 'blocks': stat.count}
+                    for stat in top
+                ]
+            }
+    
+    def report(self) -> Dict:
+        """Structured metrics: wall time, per-method timers, counters and captures"""
+        end = self.stopped if self.stopped is not None else time.perf_counter()
+        report = {
+            'wall_seconds': end - self.started,
+            'methods': {
+                name: {
+                    'calls': calls,
+                    'total_seconds': total,
+                    'mean_us': total / calls * 1e6 if calls else 0.0,
+                    'max_us': longest * 1e6
+                }
+                for name, (calls, total, longest) in self.timers.items()
+                if calls
+            },
+            'counters': dict(self.counters)
+        }
+        if self._profile_stats is not None:
+            report['profile'] = self._profile_stats
+        if self._memory is not None:
+            report['memory'] = self._memory
+        return report
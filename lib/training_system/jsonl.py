@@ -0,0 +1,253 @@
+"""Streaming JSONL reading and writing with optional .idx offset sidecars"""
+
+import json
+import mmap
+import os
+import sys
+from array import array
+from itertools import islice
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Union
+
+from .examples import TrainingExample, example_from_dict, example_to_json
+
+
+def _project(record: Dict, fields: Iterable[str]) -> Dict:
+    """Keep only the given dotted field paths (e.g. 'metadata.quality_score')"""
+    projected: Dict = {}
+    for path in fields:
+        source, target = record, projected
+        *parents, leaf = path.split('.')
+        for part in parents:
+            source = source.get(part) if isinstance(source, dict) else None
+            if source is None:
+                break
+            target = target.setdefault(part, {})
+        else:
+            if isinstance(source, dict) and leaf in source:
+                target[leaf] = source[leaf]
+    return projected
+
+
+def iter_training_jsonl(
+    filename: str,
+    fields: Optional[Iterable[str]] = None,
+    skip: int = 0,
+    limit: Optional[int] = None
+) -> Iterator[TrainingExample]:
+    """Lazily read training examples from a JSONL file, one line at a time
+    
+    fields projects each record onto dotted paths such as
+    ['output', 'metadata.quality_score']; fields that are not kept get empty
+    defaults. skip and limit count records, and skipped lines are not parsed.
+    """
+    fields = list(fields) if fields is not None else None
+    stop = None if limit is None else skip + limit
+    with open(filename, 'r', encoding='utf-8') as f:
+        lines = (line for line in f if line.strip())
+        for line in islice(lines, skip, stop):
+            record = json.loads(line)
+            if fields is not None:
+                record = _project(record, fields)
+            yield example_from_dict(record)
+
+
+_IO_BUFFER = 1 << 20
+
+
+def open_input(path: str) -> BinaryIO:
+    """Binary reader for path ('-' is stdin); .gz and .xz are decompressed"""
+    if path == '-':
+        return sys.stdin.buffer
+    # Compression modules are imported only when a compressed file is seen
+    if path.endswith('.gz'):
+        import gzip
+        return gzip.open(path, 'rb')
+    if path.endswith('.xz'):
+        import lzma
+        return lzma.open(path, 'rb')
+    return open(path, 'rb', buffering=_IO_BUFFER)
+
+
+def open_output(path: str) -> BinaryIO:
+    """Binary writer for path ('-' is stdout); .gz and .xz are compressed"""
+    if path == '-':
+        return sys.stdout.buffer
+    if path.endswith('.gz'):
+        import gzip
+        return gzip.open(path, 'wb')
+    if path.endswith('.xz'):
+        import lzma
+        return lzma.open(path, 'wb')
+    return open(path, 'wb', buffering=_IO_BUFFER)
+
+
+def index_path_for(filename: str) -> str:
+    """Default sidecar index path for a JSONL file"""
+    return filename + '.idx'
+
+
+def _offsets_bytes(offsets: array) -> bytes:
+    """Offsets as little-endian uint64 bytes (the .idx on-disk format)"""
+    if sys.byteorder != 'little':
+        offsets = array('Q', offsets)
+        offsets.byteswap()
+    return offsets.tobytes()
+
+
+def build_jsonl_index(filename: str, index_path: Optional[str] = None) -> int:
+    """Write a .idx sidecar for an existing JSONL file; returns the record count
+    
+    The sidecar is a flat array of little-endian uint64 byte offsets, one per
+    non-blank line, each pointing at the start of a record.
+    """
+    index_path = index_path or index_path_for(filename)
+    offsets = array('Q')
+    position = 0
+    count = 0
+    with open(filename, 'rb') as data, open(index_path + '.tmp', 'wb') as index:
+        for line in data:
+            if line.strip():
+                offsets.append(position)
+                count += 1
+                if len(offsets) >= 65536:
+                    index.write(_offsets_bytes(offsets))
+                    del offsets[:]
+            position += len(line)
+        index.write(_offsets_bytes(offsets))
+    os.replace(index_path + '.tmp', index_path)
+    return count
+
+
+class JsonlSink:
+    """Buffered JSONL writer that training examples are streamed into
+    
+    With index=True a .idx offset sidecar (see build_jsonl_index) is written
+    alongside and flushed together with the data.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        append: bool = False,
+        flush_interval: int = 100,
+        buffer_size: int = 1 << 16,
+        index: bool = False
+    ):
+        self.filename = filename
+        self.flush_interval = flush_interval
+        self.count = 0
+        self._index_file = None
+        self._offsets = array('Q')
+        if index:
+            index_path = index_path_for(filename)
+            if append and os.path.exists(filename) and not os.path.exists(index_path):
+                build_jsonl_index(filename, index_path)
+            self._index_file = open(index_path, 'ab' if append else 'wb')
+        self._file = open(filename, 'ab' if append else 'wb', buffering=buffer_size)
+        self._position = self._file.tell()
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def write(self, example: TrainingExample):
+        """Write one example, flushing every flush_interval examples"""
+        self.write_line((example_to_json(example) + '\n').encode('utf-8'))
+
+    def write_line(self, line: bytes):
+        """Write one already serialized record, newline included"""
+        self._file.write(line)
+        if self._index_file is not None:
+            self._offsets.append(self._position)
+        self._position += len(line)
+        self.count += 1
+        if self.flush_interval > 0 and self.count % self.flush_interval == 0:
+            self.flush()
+
+    def flush(self):
+        """Push buffered lines to the file so readers can see them"""
+        self._file.flush()
+        # The index is flushed after the data so it never points past it
+        if self._index_file is not None:
+            self._index_file.write(_offsets_bytes(self._offsets))
+            self._index_file.flush()
+            del self._offsets[:]
+
+    def close(self):
+        """Flush and close the underlying file"""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+            if self._index_file is not None:
+                self._index_file.close()
+
+    def __enter__(self) -> "JsonlSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class IndexedJsonlReader:
+    """Random access to a JSONL file through mmap and its .idx sidecar
+    
+    Fetching record i reads only that line; nothing before it is parsed.
+    """
+
+    def __init__(self, filename: str, index_path: Optional[str] = None):
+        index_path = index_path or index_path_for(filename)
+        self._data_file = open(filename, 'rb')
+        self._index_file = open(index_path, 'rb')
+        data_size = os.fstat(self._data_file.fileno()).st_size
+        index_size = os.fstat(self._index_file.fileno()).st_size
+        self._data = mmap.mmap(self._data_file.fileno(), 0, access=mmap.ACCESS_READ) if data_size else b''
+        self._index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ) if index_size else b''
+        if sys.byteorder == 'little':
+            self._offsets = memoryview(self._index).cast('B').cast('Q')
+        else:
+            self._offsets = array('Q', bytes(self._index))
+            self._offsets.byteswap()
+        if len(self._offsets) and self._offsets[-1] >= data_size:
+            self.close()
+            raise ValueError(f"{index_path} is stale for {filename}")
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def raw(self, i: int) -> bytes:
+        """Bytes of record i without the trailing newline"""
+        if i < 0:
+            i += len(self._offsets)
+        start = self._offsets[i]
+        end = self._data.find(b'\n', start)
+        return self._data[start:] if end < 0 else self._data[start:end]
+
+    def record(self, i: int) -> Dict:
+        """Parsed JSON record i"""
+        return json.loads(self.raw(i))
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[TrainingExample, List[TrainingExample]]:
+        if isinstance(i, slice):
+            return [example_from_dict(self.record(j)) for j in range(*i.indices(len(self)))]
+        return example_from_dict(self.record(i))
+
+    def iter_range(self, start: int, stop: Optional[int] = None) -> Iterator[TrainingExample]:
+        """Yield examples start..stop-1 (e.g. one worker's slice of a corpus)"""
+        stop = len(self) if stop is None else min(stop, len(self))
+        for i in range(start, stop):
+            yield example_from_dict(self.record(i))
+
+    def close(self):
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        for mapped in (self._data, self._index):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        self._data_file.close()
+        self._index_file.close()
+
+    def __enter__(self) -> "IndexedJsonlReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,231 @@
+"""Memory-mappable packed binary corpus format"""
+
+import json
+import mmap
+import os
+import shutil
+import struct
+from collections import namedtuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .analysis import SOURCE_TYPES
+from .examples import ExampleMetadata, TrainingExample
+from .jsonl import JsonlSink
+
+
+# ===== Packed binary corpus =====
+# Layout: header | string table | fixed-width records | UTF-8 text blob.
+# Records hold the numeric metadata plus (offset, length) references into the
+# blob for instruction, input, output and a compact JSON "rest" holding every
+# metadata field that is not stored in the record, so the JSONL schema
+# round-trips exactly.
+
+_PACKED_MAGIC = b'TSPACK01'
+_PACKED_HEADER = struct.Struct('<8sIIQQQQQ')  # magic, version, record size, count, strings/records/blob offsets, blob size
+_PACKED_RECORD = struct.Struct('<dIII5IQIQIQIQI')
+_PACKED_TEXT_FIELDS = ('instruction', 'input', 'output', 'rest')
+_UINT32_MAX = 0xFFFFFFFF
+# Position of the first source-type count and first text (offset, length) pair in a record
+_PACKED_COUNTS_START = 4
+_PACKED_TEXT_START = _PACKED_COUNTS_START + len(SOURCE_TYPES)
+
+# Record flags: which numeric fields are present in the record
+PACKED_HAS_QUALITY = 1
+PACKED_QUALITY_IS_INT = 2
+PACKED_HAS_CITATIONS = 4
+PACKED_HAS_WORDS = 8
+PACKED_HAS_SOURCE_TYPES = 16
+
+PackedRecord = namedtuple(
+    'PackedRecord',
+    ['quality_score', 'flags', 'citations_count', 'word_count']
+    + [f'{source_type}_count' for source_type in SOURCE_TYPES]
+    + [f'{name}_{part}' for name in _PACKED_TEXT_FIELDS for part in ('offset', 'length')]
+)
+
+
+def _fits_uint32(value) -> bool:
+    return type(value) is int and 0 <= value <= _UINT32_MAX
+
+
+def _pack_example(example: TrainingExample, blob, blob_position: int) -> Tuple[bytes, int]:
+    """Encode one example as a fixed-width record, appending its text to blob"""
+    metadata = example.metadata
+    flags = 0
+    quality = 0.0
+    citations = words = 0
+    counts = (0,) * len(SOURCE_TYPES)
+    rest = ExampleMetadata(
+        sources=metadata.sources,
+        timestamp=metadata.timestamp,
+        confidence_levels=metadata.confidence_levels,
+        extra=metadata.extra
+    )
+
+    value = metadata.quality_score
+    if type(value) in (int, float) and (type(value) is float or abs(value) < 2 ** 53):
+        flags |= PACKED_HAS_QUALITY | (PACKED_QUALITY_IS_INT if type(value) is int else 0)
+        quality = float(value)
+    else:
+        rest.quality_score = value
+    if _fits_uint32(metadata.citations_count):
+        flags |= PACKED_HAS_CITATIONS
+        citations = metadata.citations_count
+    else:
+        rest.citations_count = metadata.citations_count
+    if _fits_uint32(metadata.word_count):
+        flags |= PACKED_HAS_WORDS
+        words = metadata.word_count
+    else:
+        rest.word_count = metadata.word_count
+    source_types = metadata.source_types
+    if isinstance(source_types, tuple) and all(_fits_uint32(count) for count in source_types):
+        flags |= PACKED_HAS_SOURCE_TYPES
+        counts = source_types
+    else:
+        rest.source_types = source_types
+
+    rest_dict = rest.to_dict()
+    texts = (
+        example.instruction,
+        example.input,
+        example.output,
+        json.dumps(rest_dict, ensure_ascii=False, separators=(',', ':')) if rest_dict else ''
+    )
+    refs = []
+    for text in texts:
+        encoded = text.encode('utf-8')
+        blob.write(encoded)
+        refs.extend((blob_position, len(encoded)))
+        blob_position += len(encoded)
+    return _PACKED_RECORD.pack(quality, flags, citations, words, *counts, *refs), blob_position
+
+
+def write_packed_corpus(filename: str, examples: Iterable[TrainingExample]) -> int:
+    """Write examples in the packed binary format; returns the example count
+    
+    The text blob is staged in a temporary file so examples can be streamed.
+    """
+    strings = [name.encode('utf-8') for name in SOURCE_TYPES]
+    string_table = struct.pack('<I', len(strings)) + b''.join(
+        struct.pack('<I', len(name)) + name for name in strings
+    )
+    strings_offset = _PACKED_HEADER.size
+    records_offset = strings_offset + len(string_table)
+    blob_path = filename + '.blob.tmp'
+    count = 0
+    blob_size = 0
+    with open(filename + '.tmp', 'wb') as out, open(blob_path, 'w+b') as blob:
+        out.write(b'\0' * _PACKED_HEADER.size)
+        out.write(string_table)
+        for example in examples:
+            record, blob_size = _pack_example(example, blob, blob_size)
+            out.write(record)
+            count += 1
+        blob_offset = records_offset + count * _PACKED_RECORD.size
+        blob.seek(0)
+        shutil.copyfileobj(blob, out)
+        out.seek(0)
+        out.write(_PACKED_HEADER.pack(
+            _PACKED_MAGIC, 1, _PACKED_RECORD.size, count,
+            strings_offset, records_offset, blob_offset, blob_size
+        ))
+    os.remove(blob_path)
+    os.replace(filename + '.tmp', filename)
+    return count
+
+
+class PackedCorpusReader:
+    """Zero-copy reader for corpora written by write_packed_corpus
+    
+    The file is mmapped; numeric record fields are decoded straight from the
+    mapping and text is only decoded for examples that are actually fetched.
+    """
+
+    def __init__(self, filename: str):
+        self._file = open(filename, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        (magic, version, record_size, self.count, strings_offset,
+         records_offset, blob_offset, blob_size) = _PACKED_HEADER.unpack_from(self._view, 0)
+        if magic != _PACKED_MAGIC or record_size != _PACKED_RECORD.size:
+            self.close()
+            raise ValueError(f"{filename} is not a packed training corpus")
+        (string_count,) = struct.unpack_from('<I', self._view, strings_offset)
+        position = strings_offset + 4
+        self.strings: List[str] = []
+        for _ in range(string_count):
+            (length,) = struct.unpack_from('<I', self._view, position)
+            self.strings.append(bytes(self._view[position + 4:position + 4 + length]).decode('utf-8'))
+            position += 4 + length
+        self._records = self._view[records_offset:records_offset + self.count * record_size]
+        self._blob = self._view[blob_offset:blob_offset + blob_size]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def numeric(self, i: int) -> PackedRecord:
+        """Fixed-width record i (no text is touched)"""
+        if i < 0:
+            i += self.count
+        return PackedRecord._make(_PACKED_RECORD.unpack_from(self._records, i * _PACKED_RECORD.size))
+
+    def iter_numeric(self) -> Iterator[PackedRecord]:
+        """All fixed-width records in order"""
+        return map(PackedRecord._make, _PACKED_RECORD.iter_unpack(self._records))
+
+    def select(self, predicate) -> List[int]:
+        """Indices of examples whose PackedRecord satisfies predicate"""
+        return [i for i, record in enumerate(self.iter_numeric()) if predicate(record)]
+
+    def _text(self, offset: int, length: int) -> str:
+        return str(self._blob[offset:offset + length], 'utf-8')
+
+    def record(self, i: int) -> Dict:
+        """Example i as a dict in the JSONL schema"""
+        return self[i].to_dict()
+
+    def __getitem__(self, i: int) -> TrainingExample:
+        record = self.numeric(i)
+        instruction, input_text, output, rest = (
+            self._text(record[position], record[position + 1])
+            for position in range(_PACKED_TEXT_START, len(record), 2)
+        )
+        metadata = ExampleMetadata.from_dict(json.loads(rest) if rest else {})
+        flags = record.flags
+        if flags & PACKED_HAS_QUALITY:
+            quality = record.quality_score
+            metadata.quality_score = int(quality) if flags & PACKED_QUALITY_IS_INT else quality
+        if flags & PACKED_HAS_CITATIONS:
+            metadata.citations_count = record.citations_count
+        if flags & PACKED_HAS_WORDS:
+            metadata.word_count = record.word_count
+        if flags & PACKED_HAS_SOURCE_TYPES:
+            metadata.source_types = tuple(record[_PACKED_COUNTS_START:_PACKED_TEXT_START])
+        return TrainingExample(instruction=instruction, input=input_text, output=output, metadata=metadata)
+
+    def __iter__(self) -> Iterator[TrainingExample]:
+        for i in range(self.count):
+            yield self[i]
+
+    def to_jsonl(self, filename: str, indices: Optional[Iterable[int]] = None) -> int:
+        """Write all (or the selected) examples back out as JSONL"""
+        count = 0
+        with JsonlSink(filename, flush_interval=0) as sink:
+            for i in (range(self.count) if indices is None else indices):
+                sink.write(self[i])
+                count += 1
+        return count
+
+    def close(self):
+        for view in ('_records', '_blob', '_view'):
+            if hasattr(self, view):
+                getattr(self, view).release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "PackedCorpusReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,290 @@
+"""
+Asyncio ingestion pipeline: concurrent JSONL readers, executor-offloaded
+preparation and scoring, and an ordered or unordered writer
+
+    read (one task per file) -> [input queue] -> prepare + score (executor)
+        -> [output queue] -> write (add_training_example into the stream)
+
+Both queues are bounded, so a slow disk on the writer side stalls the
+scorers, which stall the readers. Batches waiting in the ordered writer
+for an earlier, slower one are bounded too: readers take a slot in a
+window of processors + 2 * queue_size batches, and the writer frees it.
+Memory is capped by that window times batch_size, not by the input. Each
+stage keeps record, batch and busy-time counters.
+"""
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+from .analysis import QUALITY_METRICS
+from .examples import TrainingExample
+from .jsonl import open_input
+from .system import AdvancedAITrainingSystem
+
+# Per-process (or per-thread) system used by pipeline executor workers
+_pipeline_system = None
+
+
+def _init_pipeline_worker(system_class: type):
+    """Build one system per executor worker"""
+    global _pipeline_system
+    _pipeline_system = system_class()
+
+
+def candidate_arguments(record: Dict) -> Dict:
+    """prepare_training_example keyword arguments for one candidate record
+
+    Candidates use user_query/response/sources/quality_score; exported
+    training records (instruction/output/metadata) are accepted too. A
+    missing quality_score is filled in by prepare_candidates.
+    """
+    metadata = record.get('metadata') or {}
+    return {
+        'user_query': record.get('user_query', record.get('instruction', '')),
+        'response': record.get('response', record.get('output', '')),
+        'sources': record.get('sources', metadata.get('sources', [])),
+        'quality_score': record.get('quality_score', metadata.get('quality_score')),
+        'timestamp': record.get('timestamp', metadata.get('timestamp'))
+    }
+
+
+def prepare_candidates(lines: List[bytes]) -> Tuple[List[Tuple[TrainingExample, Tuple[float, ...]]], int]:
+    """Parse, prepare and score a batch of JSONL lines in an executor worker
+
+    Returns (example, scores in QUALITY_METRICS order) pairs and the number
+    of lines that could not be turned into an example.
+    """
+    system = _pipeline_system
+    results = []
+    invalid = 0
+    for line in lines:
+        try:
+            arguments = candidate_arguments(json.loads(line))
+            scores = system.score_response(arguments['response'])
+            if arguments['quality_score'] is None:
+                arguments['quality_score'] = round(sum(scores.values()) / len(scores), 2)
+            example = system.prepare_training_example(**arguments)
+        except (ValueError, TypeError, AttributeError, KeyError):
+            invalid += 1
+            continue
+        results.append((example, tuple(scores[metric] for metric in QUALITY_METRICS)))
+    return results, invalid
+
+
+async def _run_tasks(coroutines: Iterable) -> List:
+    """Run coroutines as concurrent tasks and wait for all of them
+
+    The first failure cancels the others and is raised once they have
+    stopped, so no stage is left blocked on a queue nobody serves.
+    """
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class StageCounter:
+    """Records, batches and busy time (summed over the stage's concurrent tasks) of one stage"""
+
+    __slots__ = ('records', 'batches', 'busy', 'invalid')
+
+    def __init__(self):
+        self.records = 0
+        self.batches = 0
+        self.busy = 0.0
+        self.invalid = 0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'records': self.records,
+            'batches': self.batches,
+            'invalid': self.invalid,
+            'busy_seconds': self.busy,
+            'records_per_s': self.records / self.busy if self.busy else 0.0
+        }
+
+
+def _read_batch(f: BinaryIO, batch_size: int) -> List[bytes]:
+    batch = []
+    for line in f:
+        if line.strip():
+            batch.append(line)
+            if len(batch) >= batch_size:
+                break
+    return batch
+
+
+class IngestionPipeline:
+    """Stream candidate JSONL files through a training system into one JSONL output
+
+    Examples go through system.add_training_example with a training stream
+    open on output, so exact/near dedupe and instrumentation apply as usual,
+    and rubric scores are recorded in system.quality_metrics. workers > 0
+    prepares and scores in a process pool (the system class must be
+    default-constructible); workers=0 uses one background thread. ordered
+    keeps the order in which batches were read; unordered writes batches
+    as soon as they are scored.
+    """
+
+    def __init__(
+        self,
+        system: AdvancedAITrainingSystem,
+        output: str,
+        workers: Optional[int] = None,
+        batch_size: int = 256,
+        queue_size: int = 8,
+        ordered: bool = True,
+        append: bool = False,
+        flush_interval: int = 1000
+    ):
+        self.system = system
+        self.output = output
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.ordered = ordered
+        self.append = append
+        self.flush_interval = flush_interval
+        self.counters = {stage: StageCounter() for stage in ('read', 'process', 'write')}
+        self.queue_high_water = {'input': 0, 'output': 0}
+        self.accepted = 0
+        self.wall_seconds = 0.0
+
+    def _executor(self) -> Executor:
+        initargs = (type(self.system),)
+        if self.workers > 0:
+            return ProcessPoolExecutor(self.workers, initializer=_init_pipeline_worker, initargs=initargs)
+        return ThreadPoolExecutor(1, initializer=_init_pipeline_worker, initargs=initargs)
+
+    async def _reader(self, path: str, queue: asyncio.Queue, sequence: List[int], window: asyncio.Semaphore):
+        counter = self.counters['read']
+        f = await asyncio.to_thread(open_input, path)
+        try:
+            while True:
+                start = time.perf_counter()
+                batch = await asyncio.to_thread(_read_batch, f, self.batch_size)
+                counter.busy += time.perf_counter() - start
+                if not batch:
+                    return
+                counter.records += len(batch)
+                counter.batches += 1
+                # A batch enters the window before it is numbered and leaves
+                # it once written, which bounds the writer's reorder buffer
+                await window.acquire()
+                # Sequence numbers follow queue order, which is what ordered
+                # output preserves across concurrently read files
+                number = sequence[0]
+                sequence[0] += 1
+                await queue.put((number, batch))
+                self.queue_high_water['input'] = max(self.queue_high_water['input'], queue.qsize())
+        finally:
+            await asyncio.to_thread(f.close)
+
+    async def _processor(self, executor: Executor, inbox: asyncio.Queue, outbox: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        counter = self.counters['process']
+        while True:
+            item = await inbox.get()
+            if item is None:
+                await outbox.put(None)
+                return
+            number, batch = item
+            start = time.perf_counter()
+            results, invalid = await loop.run_in_executor(executor, prepare_candidates, batch)
+            counter.busy += time.perf_counter() - start
+            counter.records += len(results)
+            counter.invalid += invalid
+            counter.batches += 1
+            await outbox.put((number, results))
+            self.queue_high_water['output'] = max(self.queue_high_water['output'], outbox.qsize())
+
+    def _write_batch(self, results: List[Tuple[TrainingExample, Tuple[float, ...]]]) -> int:
+        metrics = [self.system.quality_metrics[metric] for metric in QUALITY_METRICS]
+        accepted = 0
+        for example, scores in results:
+            for series, value in zip(metrics, scores):
+                series.append(value)
+            accepted += self.system.add_training_example(example, scores)
+        return accepted
+
+    async def _writer(self, inbox: asyncio.Queue, producers: int, window: asyncio.Semaphore):
+        counter = self.counters['write']
+        pending: Dict[int, List] = {}
+        next_number = 0
+        while producers:
+            item = await inbox.get()
+            if item is None:
+                producers -= 1
+                continue
+            if not self.ordered:
+                ready = [item[1]]
+            else:
+                # Out-of-order batches wait here; the window caps how many
+                pending[item[0]] = item[1]
+                ready = []
+                while next_number in pending:
+                    ready.append(pending.pop(next_number))
+                    next_number += 1
+            for results in ready:
+                start = time.perf_counter()
+                self.accepted += await asyncio.to_thread(self._write_batch, results)
+                counter.busy += time.perf_counter() - start
+                counter.records += len(results)
+                counter.batches += 1
+                window.release()
+
+    async def run(self, paths: Iterable[str]) -> Dict:
+        """Ingest every path concurrently; returns stats()"""
+        paths = list(paths)
+        started = time.perf_counter()
+        inbox: asyncio.Queue = asyncio.Queue(self.queue_size)
+        outbox: asyncio.Queue = asyncio.Queue(self.queue_size)
+        # Enough processing tasks to keep every executor worker busy
+        processors = max(1, self.workers) * 2
+        sequence = [0]
+        # Batches read but not yet written: enough to fill both queues and
+        # every processor, so a slow batch stalls the readers instead of
+        # letting the batches behind it pile up in the writer
+        window = asyncio.Semaphore(processors + 2 * self.queue_size)
+        executor = self._executor()
+        self.system.open_training_stream(self.output, append=self.append, flush_interval=self.flush_interval)
+
+        async def feed():
+            await _run_tasks(self._reader(path, inbox, sequence, window) for path in paths)
+            for _ in range(processors):
+                await inbox.put(None)
+
+        try:
+            await _run_tasks([
+                feed(),
+                self._writer(outbox, processors, window),
+                *(self._processor(executor, inbox, outbox) for _ in range(processors))
+            ])
+        finally:
+            self.system.close_training_stream()
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.wall_seconds = time.perf_counter() - started
+        return self.stats()
+
+    def stats(self) -> Dict:
+        """Per-stage counters, queue high-water marks and overall throughput"""
+        return {
+            'wall_seconds': self.wall_seconds,
+            'records_per_s': self.counters['write'].records / self.wall_seconds if self.wall_seconds else 0.0,
+            'accepted': self.accepted,
+            'stages': {stage: counter.stats() for stage, counter in self.counters.items()},
+            'queue_high_water': dict(self.queue_high_water)
+        }
+
+
+def ingest(paths: Iterable[str], output: str, system: Optional[AdvancedAITrainingSystem] = None, **options) -> Dict:
+    """Run an IngestionPipeline to completion from synchronous code"""
+    system = system or AdvancedAITrainingSystem(keep_metric_values=False)
+    return asyncio.run(IngestionPipeline(system, output, **options).run(paths))
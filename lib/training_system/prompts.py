@@ -0,0 +1,231 @@
+"""System prompt loading from the TypeScript prompt files"""
+
+import glob
+import os
+import re
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple, Union
+
+from .analysis import estimate_tokens
+
+
+SYSTEM_PROMPT_FILE = 'ultra-enhanced-system-prompt.ts'
+SYSTEM_PROMPT_NAME = 'ULTRA_ENHANCED_SYSTEM_PROMPT'
+DEFAULT_SYSTEM_PROMPT = "Ultra Enhanced System Prompt"
+
+# An exported template literal with its precomputed size
+PromptTemplate = namedtuple('PromptTemplate', ['name', 'text', 'chars', 'tokens'])
+
+# Characters the TypeScript lexer stops at outside template literals
+_TS_SIGNIFICANT = re.compile(r"[`'\"/]")
+_TS_EXPORT_DECL = re.compile(
+    r'export\s+(?:const|let|var)\s+(?P<name>[A-Za-z_$][\w$]*)\s*(?::[^=;]*)?=\s*$'
+)
+_TS_IDENTIFIER = re.compile(r'\s*([A-Za-z_$][\w$]*)\s*')
+_TEMPLATE_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+# \xHH, \uHHHH and \u{H...} escapes, matched just after the backslash
+_TEMPLATE_CODE_ESCAPE = re.compile(r'x([0-9A-Fa-f]{2})|u([0-9A-Fa-f]{4})|u\{([0-9A-Fa-f]+)\}')
+_LINE_TERMINATORS = '\n\r\u2028\u2029'
+_LINE_TERMINATOR = re.compile('[\n\r\u2028\u2029]')
+
+
+def _scan_quoted(source: str, pos: int) -> int:
+    """Index just past the '...' or "..." string starting at pos"""
+    quote = source[pos]
+    i = pos + 1
+    while i < len(source):
+        char = source[i]
+        if char == '\\':
+            i += 2
+        elif char == quote or char in _LINE_TERMINATORS:
+            return i + 1
+        else:
+            i += 1
+    return i
+
+
+def _cook_escape(source: str, pos: int) -> Tuple[int, str]:
+    """Index just past the escape sequence at the backslash at pos, and its cooked text
+    
+    Follows TypeScript: a backslash before a line terminator is a line
+    continuation and cooks to nothing; any other escaped character that
+    is not special stands for itself.
+    """
+    escaped = source[pos + 1]
+    if escaped in _LINE_TERMINATORS:
+        end = pos + 2
+        if source.startswith('\r\n', pos + 1):
+            end += 1
+        return end, ''
+    match = _TEMPLATE_CODE_ESCAPE.match(source, pos + 1)
+    if match is not None:
+        code = int(next(group for group in match.groups() if group is not None), 16)
+        if code <= 0x10FFFF:
+            return match.end(), chr(code)
+    return pos + 2, _TEMPLATE_ESCAPES.get(escaped, escaped)
+
+
+def _scan_template(source: str, pos: int) -> Tuple[int, List[Union[str, Tuple[str]]]]:
+    """Lex the template literal starting at the backtick at pos
+    
+    Returns the index just past the closing backtick and its parts: cooked
+    text strings and 1-tuples holding the source of each ${...} expression.
+    Nested strings, comments and templates inside expressions are skipped.
+    """
+    parts: List[Union[str, Tuple[str]]] = []
+    chunk: List[str] = []
+    i = pos + 1
+    n = len(source)
+    while i < n:
+        char = source[i]
+        if char == '`':
+            parts.append(''.join(chunk))
+            return i + 1, parts
+        if char == '\\' and i + 1 < n:
+            i, cooked = _cook_escape(source, i)
+            chunk.append(cooked)
+        elif char == '$' and source.startswith('{', i + 1):
+            parts.append(''.join(chunk))
+            chunk = []
+            start = i = i + 2
+            depth = 1
+            while i < n and depth:
+                char = source[i]
+                if char in '\'"':
+                    i = _scan_quoted(source, i)
+                    continue
+                if char == '`':
+                    i = _scan_template(source, i)[0]
+                    continue
+                if char == '{':
+                    depth += 1
+                elif char == '}':
+                    depth -= 1
+                i += 1
+            parts.append((source[start:i - 1],))
+        else:
+            # Copy the run of plain text up to the next special character
+            end = i + 1
+            while end < n and source[end] not in '`\\$':
+                end += 1
+            text = source[i:end]
+            if '\r' in text:
+                # Like TypeScript, CRLF and CR line breaks cook to LF
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            chunk.append(text)
+            i = end
+    parts.append(''.join(chunk))
+    return n, parts
+
+
+def extract_template_literals(source: str) -> Dict[str, str]:
+    """Named template literals exported from TypeScript source
+    
+    Handles escaped backticks, comments, quoted strings and any number of
+    literals per file. ${NAME} substitutions of literals exported earlier in
+    the same file are inlined; other expressions are kept verbatim.
+    """
+    literals: Dict[str, str] = {}
+    pos = 0
+    statement_start = 0
+    n = len(source)
+    while True:
+        match = _TS_SIGNIFICANT.search(source, pos)
+        if match is None:
+            return literals
+        i = match.start()
+        char = source[i]
+        if char == '/':
+            if source.startswith('//', i):
+                end = _LINE_TERMINATOR.search(source, i)
+                pos = n if end is None else end.start()
+            elif source.startswith('/*', i):
+                end = source.find('*/', i + 2)
+                pos = n if end < 0 else end + 2
+            else:
+                pos = i + 1
+            continue
+        if char != '`':
+            pos = _scan_quoted(source, i)
+            continue
+        pos, parts = _scan_template(source, i)
+        declaration = _TS_EXPORT_DECL.search(source, statement_start, i)
+        statement_start = pos
+        if declaration is None:
+            continue
+        text = []
+        for part in parts:
+            if isinstance(part, str):
+                text.append(part)
+                continue
+            identifier = _TS_IDENTIFIER.fullmatch(part[0])
+            if identifier and identifier.group(1) in literals:
+                text.append(literals[identifier.group(1)])
+            else:
+                text.append('${' + part[0] + '}')
+        literals[declaration.group('name')] = ''.join(text)
+
+
+# Resolved absolute path -> (mtime_ns, size, templates); shared by every
+# instance in the process and inherited by forked workers
+_PROMPT_FILE_CACHE: Dict[str, Tuple[int, int, Dict[str, PromptTemplate]]] = {}
+# The prompt files live in lib/, next to this package
+PROMPT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+_system_prompt_path: Optional[str] = None
+
+
+def system_prompt_path() -> Optional[str]:
+    """Locate the system prompt file in lib/ (independent of the working directory)"""
+    global _system_prompt_path
+    if _system_prompt_path is None:
+        candidate = os.path.join(PROMPT_DIRECTORY, SYSTEM_PROMPT_FILE)
+        if os.path.isfile(candidate):
+            _system_prompt_path = candidate
+    return _system_prompt_path
+
+
+def load_prompt_file(path: str) -> Dict[str, PromptTemplate]:
+    """Exported template literals of a TypeScript file, re-lexed only when its mtime or size changes"""
+    path = os.path.abspath(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        _PROMPT_FILE_CACHE.pop(path, None)
+        return {}
+    cached = _PROMPT_FILE_CACHE.get(path)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            literals = extract_template_literals(f.read())
+    except (OSError, UnicodeDecodeError):
+        return {}
+    templates = {
+        name: PromptTemplate(name, text, len(text), estimate_tokens(text))
+        for name, text in literals.items()
+    }
+    _PROMPT_FILE_CACHE[path] = (stat.st_mtime_ns, stat.st_size, templates)
+    return templates
+
+
+def load_prompt_library(directory: Optional[str] = None, pattern: str = '*prompt*.ts') -> Dict[str, PromptTemplate]:
+    """Exported template literals of every prompt file in directory (defaults to lib/)"""
+    library: Dict[str, PromptTemplate] = {}
+    for path in sorted(glob.glob(os.path.join(directory or PROMPT_DIRECTORY, pattern))):
+        library.update(load_prompt_file(path))
+    return library
+
+
+def system_prompt_template(path: Optional[str] = None, name: str = SYSTEM_PROMPT_NAME) -> PromptTemplate:
+    """The named prompt with its character and token counts, or the placeholder"""
+    path = path or system_prompt_path()
+    template = load_prompt_file(path).get(name) if path else None
+    if template is None:
+        return PromptTemplate(name, DEFAULT_SYSTEM_PROMPT, len(DEFAULT_SYSTEM_PROMPT),
+                              estimate_tokens(DEFAULT_SYSTEM_PROMPT))
+    return template
+
+
+def load_system_prompt(path: Optional[str] = None, name: str = SYSTEM_PROMPT_NAME) -> str:
+    """Load the system prompt through the process-wide prompt file cache"""
+    return system_prompt_template(path, name).text
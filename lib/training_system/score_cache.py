@@ -0,0 +1,124 @@
+"""Persistent rubric score cache (SQLite) keyed by response hash and rubric version"""
+
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .analysis import QUALITY_METRICS, AnalysisCache
+
+# SQLite's historical limit on bound parameters per statement is 999
+_LOOKUP_CHUNK = 900
+
+
+class ScoreCache:
+    """Per-metric rubric scores stored on disk, so unchanged responses are never rescored
+
+    Rows are keyed by the BLAKE2b hash of the response text plus the rubric
+    version, so editing a response or bumping the rubric version both miss.
+    Writes are buffered and committed every commit_interval new rows (and on
+    commit()/close()); buffered rows are visible to lookups immediately.
+    """
+
+    def __init__(self, path: str, rubric_version: str, commit_interval: int = 10_000):
+        self.path = path
+        self.rubric_version = str(rubric_version)
+        self.commit_interval = commit_interval
+        self.hits = 0
+        self.misses = 0
+        self._pending: Dict[bytes, Tuple[float, ...]] = {}
+        self._connection = sqlite3.connect(path)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        columns = ', '.join(f'{metric} REAL NOT NULL' for metric in QUALITY_METRICS)
+        self._connection.execute(
+            f'CREATE TABLE IF NOT EXISTS scores '
+            f'(hash BLOB NOT NULL, rubric TEXT NOT NULL, {columns}, PRIMARY KEY (hash, rubric)) WITHOUT ROWID'
+        )
+        self._select = f"SELECT hash, {', '.join(QUALITY_METRICS)} FROM scores WHERE rubric = ? AND hash IN "
+        self._insert = (
+            f"INSERT OR REPLACE INTO scores (hash, rubric, {', '.join(QUALITY_METRICS)}) "
+            f"VALUES (?, ?{', ?' * len(QUALITY_METRICS)})"
+        )
+
+    key = staticmethod(AnalysisCache.key)
+
+    def get(self, text: str) -> Optional[Tuple[float, ...]]:
+        """Stored scores in QUALITY_METRICS order, or None"""
+        return self.get_many([text])[0]
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[Tuple[float, ...]]]:
+        """Stored scores for each text (None where missing), with one query per 900 texts"""
+        keys = [self.key(text) for text in texts]
+        found: Dict[bytes, Tuple[float, ...]] = {}
+        lookup = []
+        for key in keys:
+            row = self._pending.get(key)
+            if row is not None:
+                found[key] = row
+            else:
+                lookup.append(key)
+        lookup = list(dict.fromkeys(lookup))
+        for start in range(0, len(lookup), _LOOKUP_CHUNK):
+            chunk = lookup[start:start + _LOOKUP_CHUNK]
+            query = self._select + '(' + ', '.join('?' * len(chunk)) + ')'
+            for key, *scores in self._connection.execute(query, (self.rubric_version, *chunk)):
+                found[key] = tuple(scores)
+        rows = [found.get(key) for key in keys]
+        hits = sum(row is not None for row in rows)
+        self.hits += hits
+        self.misses += len(rows) - hits
+        return rows
+
+    def put(self, text: str, scores: Tuple[float, ...]):
+        """Store scores (QUALITY_METRICS order) for text"""
+        self._pending[self.key(text)] = tuple(scores)
+        if len(self._pending) >= self.commit_interval:
+            self.commit()
+
+    def put_many(self, items: Iterable[Tuple[str, Tuple[float, ...]]]):
+        for text, scores in items:
+            self.put(text, scores)
+
+    def commit(self):
+        """Write buffered rows to disk"""
+        if self._pending:
+            rubric = self.rubric_version
+            with self._connection:
+                self._connection.executemany(
+                    self._insert,
+                    ((key, rubric, *scores) for key, scores in self._pending.items())
+                )
+            self._pending.clear()
+
+    def prune(self) -> int:
+        """Delete rows stored under other rubric versions; returns how many"""
+        self.commit()
+        with self._connection:
+            deleted = self._connection.execute(
+                'DELETE FROM scores WHERE rubric != ?', (self.rubric_version,)
+            ).rowcount
+        return deleted
+
+    def __len__(self) -> int:
+        """Rows stored for this rubric version"""
+        self.commit()
+        return self._connection.execute(
+            'SELECT COUNT(*) FROM scores WHERE rubric = ?', (self.rubric_version,)
+        ).fetchone()[0]
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def close(self):
+        self.commit()
+        self._connection.close()
+
+    def __enter__(self) -> "ScoreCache":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,44 @@
+"""Compressed, checksummed training shards"""
+
+import gzip
+import hashlib
+import json
+import lzma
+import os
+from typing import List, Optional, Tuple
+
+
+SHARD_COMPRESSION = {None: '', 'gzip': '.gz', 'xz': '.xz'}
+
+
+def _write_shard(path: str, data: bytes, compression: Optional[str]) -> Tuple[int, str]:
+    """Compress and write one shard atomically; returns (bytes on disk, sha256)"""
+    if compression == 'gzip':
+        # mtime=0 keeps the output (and its checksum) reproducible
+        data = gzip.compress(data, mtime=0)
+    elif compression == 'xz':
+        data = lzma.compress(data)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return len(data), hashlib.sha256(data).hexdigest()
+
+
+def verify_training_shards(manifest_path: str) -> List[int]:
+    """Indices of shards that are missing or do not match the manifest"""
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    directory = os.path.dirname(manifest_path)
+    bad = []
+    for shard in manifest['shards']:
+        path = os.path.join(directory, shard['file'])
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            bad.append(shard['index'])
+            continue
+        if len(data) != shard['bytes'] or hashlib.sha256(data).hexdigest() != shard['sha256']:
+            bad.append(shard['index'])
+    return bad
@@ -0,0 +1,301 @@
+"""Streaming statistics: KLL quantile sketches, metric series and sequence packing"""
+
+import math
+import random
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Percentiles reported by get_quality_statistics when sketches are enabled
+REPORTED_QUANTILES: Tuple[float, ...] = (0.5, 0.95, 0.99)
+
+
+class KLLSketch:
+    """Mergeable streaming quantile sketch (KLL) with bounded memory
+    
+    Keeps O(k) values regardless of stream length; rank error is roughly
+    1.7 / k. Sketches built on separate workers or shards can be merged.
+    """
+    
+    __slots__ = ('k', 'count', 'compactors', '_size', '_max_size', '_rng')
+    
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        self.k = k
+        self.count = 0
+        self.compactors: List[List[float]] = [[]]
+        self._size = 0
+        self._max_size = 0
+        self._rng = random.Random(seed)
+        self._refresh_max_size()
+    
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return int(math.ceil(self.k * (2 / 3) ** depth)) + 1
+    
+    def _refresh_max_size(self):
+        self._max_size = sum(self._capacity(level) for level in range(len(self.compactors)))
+    
+    def update(self, value: float):
+        """Add one value"""
+        self.compactors[0].append(value)
+        self.count += 1
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+    
+    def _compress(self):
+        # Halve the lowest full level: sort it and promote every other item
+        # (random offset) to the next level, where items weigh twice as much
+        for level in range(len(self.compactors)):
+            items = self.compactors[level]
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append([])
+                    self._refresh_max_size()
+                items.sort()
+                leftover = [items.pop()] if len(items) % 2 else []
+                offset = self._rng.randint(0, 1)
+                self.compactors[level + 1].extend(items[offset::2])
+                self.compactors[level] = leftover
+                self._size = sum(len(c) for c in self.compactors)
+                if self._size < self._max_size:
+                    break
+    
+    def merge(self, other: "KLLSketch"):
+        """Fold another sketch into this one"""
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.count += other.count
+        self._refresh_max_size()
+        self._size = sum(len(c) for c in self.compactors)
+        while self._size >= self._max_size:
+            self._compress()
+    
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        """Approximate values at the given quantiles (0-1)"""
+        qs = list(qs)
+        if not self.count:
+            return [math.nan] * len(qs)
+        weighted = sorted(
+            (value, 1 << level)
+            for level, items in enumerate(self.compactors)
+            for value in items
+        )
+        total = sum(weight for _, weight in weighted)
+        results = []
+        for q in qs:
+            target = q * total
+            cumulative = 0
+            for value, weight in weighted:
+                cumulative += weight
+                if cumulative >= target:
+                    break
+            results.append(value)
+        return results
+    
+    def quantile(self, q: float) -> float:
+        """Approximate value at quantile q (0-1)"""
+        return self.quantiles((q,))[0]
+    
+    def to_dict(self) -> Dict:
+        """JSON-serializable state, for shipping sketches between shards"""
+        return {'k': self.k, 'count': self.count, 'compactors': self.compactors}
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "KLLSketch":
+        sketch = cls(k=data['k'])
+        sketch.count = data['count']
+        sketch.compactors = [list(items) for items in data['compactors']]
+        sketch._refresh_max_size()
+        sketch._size = sum(len(c) for c in sketch.compactors)
+        return sketch
+
+
+class MetricSeries:
+    """Compact float64 score column with running statistics (Welford)
+    
+    With keep_values=False only the running statistics (and the optional
+    quantile sketch) are kept, so memory does not grow with the stream.
+    """
+    
+    __slots__ = ('values', 'count', 'mean', 'min', 'max', '_m2', 'keep_values', 'sketch')
+    
+    def __init__(
+        self,
+        values: Iterable[float] = (),
+        keep_values: bool = True,
+        sketch_k: Optional[int] = None
+    ):
+        self.values = array('d')
+        self.count = 0
+        self.mean = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._m2 = 0.0
+        self.keep_values = keep_values
+        self.sketch = KLLSketch(sketch_k) if sketch_k else None
+        self.extend(values)
+    
+    def append(self, value: float):
+        """Store a score and update the running statistics in O(1)"""
+        if self.keep_values:
+            self.values.append(value)
+        if self.sketch is not None:
+            self.sketch.update(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+    
+    def extend(self, values: Iterable[float]):
+        for value in values:
+            self.append(value)
+    
+    def merge(self, other: "MetricSeries"):
+        """Combine another series (e.g. from a worker or shard) into this one"""
+        if not other.count:
+            return
+        if self.keep_values:
+            self.values.extend(other.values)
+        if self.sketch is not None and other.sketch is not None:
+            self.sketch.merge(other.sketch)
+        # Chan et al. pairwise update of mean and M2
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+    
+    @property
+    def variance(self) -> float:
+        """Population variance of the stored scores"""
+        return self._m2 / self.count if self.count else 0.0
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.values)
+    
+    def __getitem__(self, index):
+        return self.values[index]
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, MetricSeries):
+            return self.values == other.values
+        return list(self.values) == list(other)
+    
+    def __repr__(self) -> str:
+        return f"MetricSeries(count={self.count}, mean={self.mean:.4f})"
+    
+    def stats(self) -> Dict[str, float]:
+        """Summary statistics without rescanning the stored scores"""
+        stats = {
+            'mean': self.mean,
+            'min': self.min,
+            'max': self.max,
+            'count': self.count,
+            'variance': self.variance,
+            'stdev': math.sqrt(self.variance)
+        }
+        if self.sketch is not None:
+            for q, value in zip(REPORTED_QUANTILES, self.sketch.quantiles(REPORTED_QUANTILES)):
+                stats[f'p{round(q * 100)}'] = value
+        return stats
+
+
+def plan_sequence_packing(lengths: Iterable[int], max_seq_length: int) -> Dict:
+    """Pack examples of the given token lengths into max_seq_length sequences
+    
+    Best-fit decreasing: examples are placed longest first into the fullest
+    open sequence that still has room. Open sequences are indexed by remaining
+    capacity (a sorted list of distinct capacities plus a stack of sequence
+    ids per capacity), so each placement is a bisect rather than a scan over
+    all sequences. Examples longer than max_seq_length get a sequence of their
+    own and are listed as oversized (they will be truncated).
+    """
+    lengths = array('I', lengths)
+    order = sorted(range(len(lengths)), key=lengths.__getitem__, reverse=True)
+    sequences: List[List[int]] = []
+    used = array('I')
+    capacities: List[int] = []
+    open_by_capacity: Dict[int, List[int]] = {}
+    oversized = []
+    
+    for index in order:
+        length = lengths[index]
+        if length >= max_seq_length:
+            if length > max_seq_length:
+                oversized.append(index)
+            sequences.append([index])
+            used.append(min(length, max_seq_length))
+            continue
+        position = bisect_left(capacities, length)
+        if position < len(capacities):
+            capacity = capacities[position]
+            stack = open_by_capacity[capacity]
+            sequence_id = stack.pop()
+            if not stack:
+                del open_by_capacity[capacity]
+                del capacities[position]
+        else:
+            sequence_id = len(sequences)
+            sequences.append([])
+            used.append(0)
+        sequences[sequence_id].append(index)
+        used[sequence_id] += length
+        remaining = max_seq_length - used[sequence_id]
+        if remaining:
+            if remaining not in open_by_capacity:
+                open_by_capacity[remaining] = []
+                insort(capacities, remaining)
+            open_by_capacity[remaining].append(sequence_id)
+    
+    total_tokens = sum(min(length, max_seq_length) for length in lengths)
+    return {
+        'max_seq_length': max_seq_length,
+        'num_examples': len(lengths),
+        'num_sequences': len(sequences),
+        'total_tokens': total_tokens,
+        # Share of sequence slots holding real tokens, packed vs one example per sequence
+        'padding_efficiency': total_tokens / (len(sequences) * max_seq_length) if sequences else 0.0,
+        'unpacked_efficiency': total_tokens / (len(lengths) * max_seq_length) if lengths else 0.0,
+        'oversized': oversized,
+        'sequences': [
+            {'examples': examples, 'tokens': tokens}
+            for examples, tokens in zip(sequences, used)
+        ]
+    }
+
+
+def corpus_length_stats(lengths: Iterable[int], sketch_k: int = 400) -> Dict:
+    """Example count, token total and length percentiles in one streaming pass"""
+    sketch = KLLSketch(sketch_k)
+    count = total = 0
+    longest = 0
+    for length in lengths:
+        sketch.update(length)
+        count += 1
+        total += length
+        if length > longest:
+            longest = length
+    p50, p90, p95, p99 = sketch.quantiles((0.5, 0.9, 0.95, 0.99)) if count else (0, 0, 0, 0)
+    return {
+        'examples': count,
+        'total_tokens': total,
+        'mean_tokens': total / count if count else 0.0,
+        'p50_tokens': p50,
+        'p90_tokens': p90,
+        'p95_tokens': p95,
+        'p99_tokens': p99,
+        'max_tokens': longest
+    }
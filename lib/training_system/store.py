@@ -0,0 +1,304 @@
+"""Indexed SQLite example store with filtered streaming JSONL export"""
+
+import json
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .analysis import QUALITY_METRICS, SOURCE_TYPES, detect_language
+from .examples import ExampleMetadata, TrainingExample, example_from_dict, example_to_json
+from .jsonl import JsonlSink
+
+_SOURCE_COLUMNS = tuple(f'{source_type}_count' for source_type in SOURCE_TYPES)
+# Filterable columns. They live in a narrow table apart from the (large)
+# records so filtering never pages through texts
+_COLUMNS = ('quality_score', 'citations_count', 'word_count', 'language') + _SOURCE_COLUMNS + QUALITY_METRICS
+_COLUMN_TYPES = dict.fromkeys(_COLUMNS, 'REAL')
+_COLUMN_TYPES.update(dict.fromkeys(('citations_count', 'word_count') + _SOURCE_COLUMNS, 'INTEGER'))
+_COLUMN_TYPES['language'] = 'TEXT'
+ORDER_COLUMNS = ('id',) + _COLUMNS
+# Columns of the usual curation filters (quality, language, source mix).
+# Their indexes cover each other, so those filters never read table rows;
+# the other columns get single-column indexes, which keeps the indexes at
+# about a third of the size of covering every column with every other
+_COVERED_COLUMNS = ('quality_score', 'language') + _SOURCE_COLUMNS
+
+# A filter is driven by an index only when its condition matches less than
+# this share of the rows; broader filters are cheaper as a table scan
+_INDEX_SELECTIVITY = 0.25
+# Condition probes start at this many index entries and grow 4x per round
+_PROBE_START = 1024
+_CACHE_KIB = 64 * 1024
+
+Condition = Tuple[str, str, object]
+
+
+def example_columns(
+    metadata: Union[Dict, ExampleMetadata],
+    output: str,
+    scores: Optional[Sequence[float]] = None
+) -> Tuple:
+    """Indexed column values (in store column order) for one record
+
+    metadata is a JSONL metadata dict or ExampleMetadata. A missing
+    word_count is counted from output, and a missing 'language' metadata
+    key is detected from it; scores are in QUALITY_METRICS order.
+    """
+    word_count = metadata.get('word_count')
+    if word_count is None:
+        word_count = len(output.split())
+    source_types = metadata.get('source_types') or {}
+    return (
+        metadata.get('quality_score'),
+        metadata.get('citations_count'),
+        word_count,
+        metadata.get('language') or detect_language(output),
+        *(source_types.get(source_type, 0) for source_type in SOURCE_TYPES),
+        *(scores if scores is not None else (None,) * len(QUALITY_METRICS))
+    )
+
+
+class ExampleStore:
+    """Training examples in an SQLite file with indexed curation columns
+
+    Indexed columns: quality_score, citations_count, word_count, language
+    ('ar'/'en'), one <type>_count per source type and one column per rubric
+    metric. Rows are buffered and inserted in one transaction every
+    commit_interval rows; reads commit first. One writer at a time. Filters
+    (all optional, combined with AND):
+
+        min_quality / max_quality, min_citations, min_words / max_words,
+        language, min_scores={'accuracy': 8, ...}, min_source_types={'peer': 3, ...}
+
+    Every filter column leads an index. The indexes of quality_score,
+    language and the source counts also cover each other, so filters on
+    those read one index range and no table rows; other conditions are
+    checked on the narrow examples rows. Each insert updates one index per
+    filter column (see bulk_load for large loads). SQLite cannot
+    tell how selective a range is, so each filtered query first counts its
+    conditions on their indexes and is driven by the most selective one.
+    Matching records are streamed from the cursor, never collected.
+    """
+
+    def __init__(self, path: str, commit_interval: int = 10_000):
+        self.path = path
+        self.commit_interval = commit_interval
+        self._pending: List[Tuple] = []
+        self._connection = sqlite3.connect(path)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        # Inserts touch one page of every index; the 2 MB default cache thrashes
+        self._connection.execute(f'PRAGMA cache_size=-{_CACHE_KIB}')
+        columns = ', '.join(f'{column} {_COLUMN_TYPES[column]}' for column in _COLUMNS)
+        with self._connection:
+            self._connection.execute(f'CREATE TABLE IF NOT EXISTS examples (id INTEGER PRIMARY KEY, {columns})')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS records (id INTEGER PRIMARY KEY, record BLOB NOT NULL)')
+        self._create_indexes()
+        self._insert = f"INSERT INTO examples VALUES ({', '.join('?' * (len(_COLUMNS) + 1))})"
+        # Ids are assigned here so both tables can be filled with executemany
+        self._next_id = self._last_id() + 1
+
+    def _create_indexes(self):
+        # Every filter column leads an index of its own; the curation
+        # columns' indexes also cover each other
+        with self._connection:
+            for column in _COLUMNS:
+                if column in _COVERED_COLUMNS:
+                    columns = (column,) + tuple(other for other in _COVERED_COLUMNS if other != column)
+                else:
+                    columns = (column,)
+                self._connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS examples_{column} ON examples ({', '.join(columns)})"
+                )
+
+    @contextmanager
+    def bulk_load(self) -> Iterator["ExampleStore"]:
+        """Drop the column indexes while many rows are added, rebuilding them after
+
+        Building each index once is several times faster than updating every
+        index per row. Do not query the store inside the block.
+        """
+        self.commit()
+        with self._connection:
+            for column in _COLUMNS:
+                self._connection.execute(f'DROP INDEX IF EXISTS examples_{column}')
+        try:
+            yield self
+        finally:
+            self.commit()
+            self._create_indexes()
+
+    def _last_id(self) -> int:
+        return self._connection.execute('SELECT COALESCE(MAX(id), 0) FROM examples').fetchone()[0]
+
+    def add(self, example: TrainingExample, scores: Optional[Sequence[float]] = None):
+        """Add one example; scores are rubric scores in QUALITY_METRICS order"""
+        self.add_record(example_to_json(example).encode('utf-8'), example.metadata, example.output, scores)
+
+    def add_record(
+        self,
+        line: bytes,
+        metadata: Union[Dict, ExampleMetadata],
+        output: str,
+        scores: Optional[Sequence[float]] = None
+    ):
+        """Add an already serialized JSONL line (stored and exported as is)"""
+        self._pending.append((self._next_id, line.rstrip(b'\r\n'), example_columns(metadata, output, scores)))
+        self._next_id += 1
+        if len(self._pending) >= self.commit_interval:
+            self.commit()
+
+    def add_many(self, items: Iterable[Tuple[TrainingExample, Optional[Sequence[float]]]]) -> int:
+        """Add (example, scores) pairs; returns how many"""
+        count = 0
+        for example, scores in items:
+            self.add(example, scores)
+            count += 1
+        return count
+
+    def commit(self):
+        """Insert buffered rows in one transaction"""
+        if self._pending:
+            with self._connection:
+                self._connection.executemany(
+                    self._insert, ((row_id, *columns) for row_id, _, columns in self._pending)
+                )
+                self._connection.executemany(
+                    'INSERT INTO records VALUES (?, ?)', ((row_id, line) for row_id, line, _ in self._pending)
+                )
+            self._pending.clear()
+
+    def _conditions(
+        self,
+        min_quality: Optional[float] = None,
+        max_quality: Optional[float] = None,
+        min_citations: Optional[int] = None,
+        min_words: Optional[int] = None,
+        max_words: Optional[int] = None,
+        language: Optional[str] = None,
+        min_scores: Optional[Dict[str, float]] = None,
+        min_source_types: Optional[Dict[str, int]] = None
+    ) -> List[Condition]:
+        """(column, SQL, value) for every filter that is set"""
+        conditions = []
+        for column, operator, value in (
+            ('quality_score', '>=', min_quality),
+            ('quality_score', '<=', max_quality),
+            ('citations_count', '>=', min_citations),
+            ('word_count', '>=', min_words),
+            ('word_count', '<=', max_words),
+            ('language', '=', language)
+        ):
+            if value is not None:
+                conditions.append((column, f'{column} {operator} ?', value))
+        for metric, value in (min_scores or {}).items():
+            if metric not in QUALITY_METRICS:
+                raise ValueError(f"unknown metric {metric!r}, expected one of {QUALITY_METRICS}")
+            conditions.append((metric, f'{metric} >= ?', value))
+        for source_type, value in (min_source_types or {}).items():
+            if source_type not in SOURCE_TYPES:
+                raise ValueError(f"unknown source type {source_type!r}, expected one of {SOURCE_TYPES}")
+            conditions.append((f'{source_type}_count', f'{source_type}_count >= ?', value))
+        return conditions
+
+    def _probe(self, condition: Condition, limit: int) -> int:
+        """Rows matching one condition, counted on its index up to limit"""
+        column, sql, value = condition
+        return self._connection.execute(
+            f'SELECT COUNT(*) FROM (SELECT 1 FROM examples INDEXED BY examples_{column} WHERE {sql} LIMIT ?)',
+            (value, limit)
+        ).fetchone()[0]
+
+    def _choose_index(self, conditions: List[Condition]) -> Optional[str]:
+        """Column whose condition matches fewest rows, or None to scan the table
+
+        All conditions are counted on their indexes in rounds of growing
+        limits, so the cost is bounded by a few times the best count rather
+        than by the broadest condition.
+        """
+        cap = int(self._last_id() * _INDEX_SELECTIVITY)
+        limit = _PROBE_START
+        while True:
+            limit = min(limit, cap)
+            counts = [(self._probe(condition, limit), condition[0]) for condition in conditions]
+            finished = [(count, column) for count, column in counts if count < limit]
+            if finished:
+                return min(finished)[1]
+            if limit >= cap:
+                return None
+            limit *= 4
+
+    def _from(self, conditions: List[Condition]) -> Tuple[str, List]:
+        """FROM/WHERE clause for conditions, driven by the most selective index"""
+        if not conditions:
+            return 'examples', []
+        column = self._choose_index(conditions)
+        source = f'examples INDEXED BY examples_{column}' if column is not None else 'examples NOT INDEXED'
+        where = ' WHERE ' + ' AND '.join(sql for _, sql, _ in conditions)
+        return source + where, [value for _, _, value in conditions]
+
+    def count(self, **filters) -> int:
+        """Number of stored examples matching filters"""
+        self.commit()
+        conditions = self._conditions(**filters)
+        if len(conditions) == 1:
+            # One index covers the condition, however many rows match
+            column, sql, value = conditions[0]
+            source, params = f'examples INDEXED BY examples_{column} WHERE {sql}', [value]
+        else:
+            source, params = self._from(conditions)
+        return self._connection.execute(f'SELECT COUNT(*) FROM {source}', params).fetchone()[0]
+
+    def iter_lines(self, order_by: Optional[str] = 'id', limit: Optional[int] = None, **filters) -> Iterator[bytes]:
+        """Stored JSONL lines (without newline) matching filters
+
+        order_by is 'id' (insertion order), another indexed column,
+        '-column' for descending, or None for whatever order is cheapest.
+        Filters are checked (ValueError) before the first line is read.
+        """
+        if order_by is not None and order_by.lstrip('-') not in ORDER_COLUMNS:
+            raise ValueError(f"cannot order by {order_by!r}, expected one of {ORDER_COLUMNS}")
+        self.commit()
+        source, params = self._from(self._conditions(**filters))
+        # Matching ids are found and ordered on the narrow table first, then
+        # each record is fetched by id. SQLite drops ORDER BY from a subquery
+        # without LIMIT, so there always is one (-1 is no limit)
+        query = f'SELECT records.record FROM (SELECT examples.id FROM {source}'
+        if order_by is not None:
+            query += f" ORDER BY examples.{order_by.lstrip('-')}{' DESC' if order_by.startswith('-') else ''}"
+        query += ' LIMIT ?) AS matches CROSS JOIN records ON records.id = matches.id'
+        params.append(-1 if limit is None else limit)
+        return (line for (line,) in self._connection.execute(query, params))
+
+    def query(self, order_by: Optional[str] = 'id', limit: Optional[int] = None, **filters) -> Iterator[TrainingExample]:
+        """Stored examples matching filters (see iter_lines)"""
+        return (example_from_dict(json.loads(line)) for line in self.iter_lines(order_by, limit, **filters))
+
+    def export_jsonl(
+        self,
+        filename: str,
+        append: bool = False,
+        index: bool = False,
+        order_by: Optional[str] = 'id',
+        limit: Optional[int] = None,
+        **filters
+    ) -> int:
+        """Stream the matching records to a JSONL file; returns how many were written"""
+        with JsonlSink(filename, append=append, flush_interval=0, index=index) as sink:
+            for line in self.iter_lines(order_by, limit, **filters):
+                sink.write_line(line + b'\n')
+        return sink.count
+
+    def __len__(self) -> int:
+        self.commit()
+        return self._connection.execute('SELECT COUNT(*) FROM examples').fetchone()[0]
+
+    def close(self):
+        self.commit()
+        self._connection.close()
+
+    def __enter__(self) -> "ExampleStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,880 @@
+"""AdvancedAITrainingSystem: example preparation, quality scoring and export"""
+
+import json
+import os
+from array import array
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from .analysis import QUALITY_METRICS, AnalysisCache, ResponseFeatures, estimate_tokens
+from .examples import ExampleMetadata, Source, TrainingExample, dedupe_key, example_to_json, example_token_count
+from .instrumentation import INSTRUMENTED_METHODS, Instrumentation
+from .jsonl import JsonlSink, iter_training_jsonl
+from .stats import MetricSeries, corpus_length_stats, plan_sequence_packing
+from .prompts import load_system_prompt, system_prompt_template
+
+# Dedupe, packed and shard support are imported by the methods that use them,
+# which keeps start-up cheap for short-lived jobs that never need them
+if TYPE_CHECKING:
+    from .dedupe import BloomFilter, NearDuplicateIndex
+    from .score_cache import ScoreCache
+    from .store import ExampleStore
+
+# Version of the check_* rubric; bump it whenever a scoring rule changes so
+# scores persisted in a ScoreCache are recomputed
+RUBRIC_VERSION = '1'
+
+# Fine-tuning sequence length when there are no examples to measure
+DEFAULT_MAX_SEQ_LENGTH = 2048
+
+
+def _max_seq_length(p99_tokens: float) -> int:
+    """Fine-tuning sequence length for a corpus whose p99 example length is p99_tokens"""
+    # Cover 99% of examples without truncation, rounded up to a multiple
+    # of 256 and kept within what 4-bit QLoRA fine-tuning handles well
+    return min(8192, max(256, -(-int(p99_tokens) // 256) * 256))
+
+
+# Per-process scorer used by validate_quality_batch workers
+_worker_system = None
+
+
+def _init_scoring_worker(system_class: type):
+    """Build one scoring system per worker process"""
+    global _worker_system
+    _worker_system = system_class()
+
+
+def _score_chunk(responses: List[str]) -> List[Tuple[float, ...]]:
+    """Score a chunk of responses in a worker, one tuple per response in QUALITY_METRICS order"""
+    score = _worker_system.score_response
+    rows = []
+    for response in responses:
+        scores = score(response)
+        rows.append(tuple(scores[metric] for metric in QUALITY_METRICS))
+    return rows
+
+
+class AdvancedAITrainingSystem:
+    """Ultra Enhanced AI Training System"""
+    
+    # Subclasses that change check_* should override this
+    rubric_version = RUBRIC_VERSION
+    
+    def __init__(
+        self,
+        analysis_cache_size: int = 4096,
+        quantile_sketch_k: Optional[int] = None,
+        keep_metric_values: bool = True,
+        system_prompt_path: Optional[str] = None
+    ):
+        # The prompt is loaded lazily on first access to system_prompt,
+        # through the process-wide cache in load_system_prompt()
+        self.system_prompt_path = system_prompt_path
+        self._system_prompt: Optional[str] = None
+        # Shared by prepare_training_example and validate_quality; set the
+        # size to 0 to disable caching
+        self.analysis_cache = AnalysisCache(analysis_cache_size)
+        self.training_examples: List[TrainingExample] = []
+        # When set, kept examples go to this indexed SQLite store instead of
+        # training_examples, see enable_example_store()
+        self.example_store: Optional["ExampleStore"] = None
+        # When a stream is open, add_training_example writes straight to it
+        self.training_stream: Optional[JsonlSink] = None
+        self.keep_streamed_examples = False
+        # Optional exact-duplicate filter on insert, see enable_exact_dedupe()
+        self.seen_filter: Optional["BloomFilter"] = None
+        self.seen_filter_path: Optional[str] = None
+        self.exact_duplicate_count = 0
+        # Optional near-duplicate check on insert, see enable_near_dedupe()
+        self.near_duplicate_index: Optional["NearDuplicateIndex"] = None
+        self.near_duplicate_action = 'tag'
+        self.near_duplicate_count = 0
+        # quantile_sketch_k enables p50/p95/p99 in get_quality_statistics;
+        # keep_metric_values=False drops raw scores and keeps only summaries
+        self.quality_metrics: Dict[str, MetricSeries] = {
+            metric: MetricSeries(keep_values=keep_metric_values, sketch_k=quantile_sketch_k)
+            for metric in QUALITY_METRICS
+        }
+        # Optional persistent scores for unchanged responses, see enable_score_cache()
+        self.score_cache: Optional["ScoreCache"] = None
+        # Opt-in timers and counters, see enable_instrumentation()
+        self.instrumentation: Optional[Instrumentation] = None
+    
+    @property
+    def system_prompt(self) -> str:
+        """System prompt text (kept in sync with the file on disk unless assigned)"""
+        if self._system_prompt is not None:
+            return self._system_prompt
+        return load_system_prompt(self.system_prompt_path)
+    
+    @system_prompt.setter
+    def system_prompt(self, prompt: str):
+        self._system_prompt = prompt
+    
+    @property
+    def system_prompt_tokens(self) -> int:
+        """Estimated tokens of the system prompt (precomputed when the file is lexed)"""
+        if self._system_prompt is not None:
+            return estimate_tokens(self._system_prompt)
+        return system_prompt_template(self.system_prompt_path).tokens
+    
+    def _load_system_prompt(self) -> str:
+        """Load system prompt from file"""
+        return load_system_prompt(self.system_prompt_path)
+    
+    def prepare_training_example(
+        self, 
+        user_query: str, 
+        response: str, 
+        sources: List[Union[Dict, Source]], 
+        quality_score: float,
+        timestamp: Optional[str] = None
+    ) -> TrainingExample:
+        """Prepare training example in optimal format (timestamp defaults to now)"""
+        features = self.analyze_response(response)
+        example = TrainingExample(
+            instruction=user_query,
+            input="",
+            output=response,
+            metadata=ExampleMetadata(
+                sources=tuple(
+                    source if isinstance(source, Source) else Source.from_dict(source)
+                    for source in sources
+                ),
+                quality_score=quality_score,
+                timestamp=timestamp or datetime.now().isoformat(),
+                citations_count=features.citation_count,
+                word_count=features.word_count,
+                source_types=tuple(features.source_types.values()),
+                confidence_levels=tuple(features.confidence_levels)
+            )
+        )
+        return example
+    
+    def analyze_response(self, response: str) -> ResponseFeatures:
+        """Extract rubric and metadata features from a response (cached, do not mutate)"""
+        return self.analysis_cache.get(response)
+    
+    def _features(self, response: Union[str, ResponseFeatures]) -> ResponseFeatures:
+        """Accept either raw text or already extracted features"""
+        if isinstance(response, ResponseFeatures):
+            return response
+        return self.analyze_response(response)
+    
+    def count_citations(self, text: str) -> int:
+        """Count citations in response"""
+        return self.analyze_response(text).citation_count
+    
+    def _extract_source_types(self, text: str) -> Dict[str, int]:
+        """Extract source types and count them"""
+        return dict(self.analyze_response(text).source_types)
+    
+    def _extract_confidence_levels(self, text: str) -> List[float]:
+        """Extract confidence levels from text"""
+        return list(self.analyze_response(text).confidence_levels)
+    
+    def enable_exact_dedupe(
+        self,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+        path: Optional[str] = None,
+        expected: int = 0
+    ) -> "BloomFilter":
+        """Drop examples whose normalized instruction/output pair was already added
+        
+        Uses a Bloom filter, so memory is fixed but about error_rate of unique
+        examples are wrongly dropped. If path exists the filter is loaded from
+        it (so earlier runs count as seen); save_exact_dedupe() writes it back.
+        expected is how many examples this run may add: a new filter is sized
+        for at least that many, and a loaded filter keeps its original size, so
+        ValueError is raised if it has no room for them (past capacity ever
+        more unique examples would be dropped as seen).
+        """
+        from .dedupe import BloomFilter
+        
+        if path is not None and os.path.exists(path):
+            seen = BloomFilter.load(path)
+            if len(seen) + expected > seen.capacity:
+                raise ValueError(
+                    f"seen filter {path} holds {len(seen)} of its {seen.capacity} entries and has no room "
+                    f"for {expected} more; start a new filter with a larger capacity"
+                )
+            self.seen_filter = seen
+        else:
+            self.seen_filter = BloomFilter(max(capacity, expected), error_rate)
+        self.seen_filter_path = path
+        self.exact_duplicate_count = 0
+        return self.seen_filter
+    
+    def save_exact_dedupe(self, path: Optional[str] = None):
+        """Persist the seen filter for the next run"""
+        path = path or self.seen_filter_path
+        if self.seen_filter is None or path is None:
+            raise ValueError("exact dedupe is not enabled or has no path")
+        self.seen_filter.save(path)
+    
+    def enable_near_dedupe(
+        self,
+        threshold: float = 0.85,
+        action: str = 'tag',
+        num_perm: int = 128,
+        shingle_size: int = 3
+    ) -> "NearDuplicateIndex":
+        """Check every added example's output against earlier ones
+        
+        Outputs whose estimated Jaccard similarity to an indexed output is at
+        least threshold are rejected ('reject'), kept with near_duplicate_of /
+        near_duplicate_similarity metadata ('tag'), or kept and only counted
+        ('count'). Near-duplicates themselves are not indexed.
+        """
+        from .dedupe import NEAR_DUPLICATE_ACTIONS, NearDuplicateIndex
+        
+        if action not in NEAR_DUPLICATE_ACTIONS:
+            raise ValueError(f"action must be one of {NEAR_DUPLICATE_ACTIONS}, got {action!r}")
+        self.near_duplicate_index = NearDuplicateIndex(threshold, num_perm, shingle_size)
+        self.near_duplicate_action = action
+        self.near_duplicate_count = 0
+        return self.near_duplicate_index
+    
+    def _check_near_duplicate(self, example: TrainingExample) -> bool:
+        """Apply the near-duplicate policy; False means the example is rejected"""
+        index = self.near_duplicate_index
+        signature = index.signature(example.output)
+        if signature is None:
+            return True
+        match = index.query(signature)
+        if match is None:
+            index.add(signature)
+            return True
+        
+        self.near_duplicate_count += 1
+        if self.near_duplicate_action == 'reject':
+            return False
+        if self.near_duplicate_action == 'tag':
+            metadata = example.metadata
+            if metadata.extra is None:
+                metadata.extra = {}
+            metadata.extra['near_duplicate_of'] = match[0]
+            metadata.extra['near_duplicate_similarity'] = round(match[1], 4)
+        return True
+    
+    def add_training_example(self, example: TrainingExample, scores: Optional[Tuple[float, ...]] = None) -> bool:
+        """Add training example to collection (or the open training stream)
+        
+        Returns False if the example was rejected as a duplicate. scores
+        (rubric scores in QUALITY_METRICS order) are only used by the example
+        store, which scores the output itself when they are not given.
+        """
+        if self.seen_filter is not None and not self.seen_filter.add(dedupe_key(example)):
+            self.exact_duplicate_count += 1
+            return False
+        if self.near_duplicate_index is not None and not self._check_near_duplicate(example):
+            return False
+        stream = self.training_stream
+        if stream is not None:
+            if stream.closed:
+                self.training_stream = None
+            else:
+                stream.write(example)
+                if not self.keep_streamed_examples:
+                    return True
+        store = self.example_store
+        if store is not None:
+            if scores is None:
+                row = self.score_response(example.output)
+                scores = tuple(row[metric] for metric in QUALITY_METRICS)
+            store.add(example, scores)
+            return True
+        self.training_examples.append(example)
+        return True
+    
+    def open_training_stream(
+        self,
+        filename: str,
+        append: bool = False,
+        flush_interval: int = 100,
+        keep_examples: bool = False,
+        index: bool = False
+    ) -> JsonlSink:
+        """Stream every added example to a JSONL file as it arrives
+        
+        Use as a context manager (``with system.open_training_stream(path):``)
+        or call close_training_stream() when done. Unless keep_examples is set,
+        streamed examples are not kept in training_examples, so memory stays flat.
+        index=True also writes a .idx offset sidecar for IndexedJsonlReader.
+        """
+        self.close_training_stream()
+        self.training_stream = JsonlSink(
+            filename, append=append, flush_interval=flush_interval, index=index
+        )
+        self.keep_streamed_examples = keep_examples
+        return self.training_stream
+    
+    def close_training_stream(self) -> int:
+        """Close the open training stream, returning how many examples it received"""
+        stream = self.training_stream
+        if stream is None:
+            return 0
+        stream.close()
+        self.training_stream = None
+        return stream.count
+    
+    def enable_example_store(self, path: str, commit_interval: int = 10_000) -> "ExampleStore":
+        """Keep added examples in an indexed SQLite file instead of training_examples
+        
+        Memory stays flat, and curation queries (quality, rubric scores,
+        citations, source types, language, length) use the store's indexes;
+        see ExampleStore. The indexes take about 280 bytes per example (the
+        JSONL record itself is stored once, unindexed), and each added
+        example updates all 14 of them; load large corpora inside
+        store.bulk_load(). export_training_jsonl exports the store's contents.
+        """
+        from .store import ExampleStore
+        
+        self.close_example_store()
+        self.example_store = ExampleStore(path, commit_interval)
+        return self.example_store
+    
+    def close_example_store(self):
+        """Commit pending examples and close the example store"""
+        if self.example_store is not None:
+            self.example_store.close()
+            self.example_store = None
+    
+    def _corpus(self) -> Iterable[TrainingExample]:
+        """Examples the export and planning methods default to
+        
+        The example store's, in insertion order, when one is enabled (added
+        examples go there, not to training_examples); else training_examples.
+        """
+        if self.example_store is not None:
+            return self.example_store.query()
+        return self.training_examples
+    
+    def iter_training_jsonl(
+        self,
+        filename: str,
+        fields: Optional[Iterable[str]] = None,
+        skip: int = 0,
+        limit: Optional[int] = None
+    ) -> Iterator[TrainingExample]:
+        """Lazily read training examples from an existing JSONL file"""
+        return iter_training_jsonl(filename, fields=fields, skip=skip, limit=limit)
+    
+    def load_training_jsonl(
+        self,
+        filename: str,
+        fields: Optional[Iterable[str]] = None,
+        skip: int = 0,
+        limit: Optional[int] = None
+    ) -> int:
+        """Add examples from a JSONL file through add_training_example"""
+        count = 0
+        for example in iter_training_jsonl(filename, fields=fields, skip=skip, limit=limit):
+            self.add_training_example(example)
+            count += 1
+        return count
+    
+    def export_training_jsonl(self, filename: str, append: bool = False, index: bool = False):
+        """Export training data in JSONL format for fine-tuning (index=True writes a .idx sidecar)"""
+        if self.example_store is not None:
+            count = self.example_store.export_jsonl(filename, append=append, index=index)
+            print(f"Exported {count} examples to {filename}")
+            return
+        with JsonlSink(filename, append=append, flush_interval=0, index=index) as sink:
+            for example in self.training_examples:
+                sink.write(example)
+        print(f"Exported {len(self.training_examples)} examples to {filename}")
+    
+    def export_training_packed(self, filename: str, examples: Optional[Iterable[TrainingExample]] = None):
+        """Export training data in the packed binary format (see PackedCorpusReader)
+        
+        examples defaults to the example store's, if enabled, else training_examples.
+        """
+        from .packed import write_packed_corpus
+        count = write_packed_corpus(filename, self._corpus() if examples is None else examples)
+        print(f"Exported {count} examples to {filename}")
+    
+    def export_training_shards(
+        self,
+        directory: str,
+        shard_size: Optional[int] = None,
+        shard_bytes: Optional[int] = None,
+        compression: Optional[str] = None,
+        workers: Optional[int] = None,
+        prefix: str = 'training_data',
+        examples: Optional[Iterable[TrainingExample]] = None,
+        shards: Optional[Iterable[int]] = None
+    ) -> Dict:
+        """Export training data as JSONL shards plus a manifest.json
+        
+        Shards close after shard_size examples or once they reach shard_bytes
+        of uncompressed JSONL (whichever comes first; 100k examples if neither
+        is given). compression is None, 'gzip' or 'xz'. Compression and writes
+        run in a process pool with at most two pending shards per worker, so
+        examples (defaults to the example store's if enabled, else
+        training_examples; may be any iterable such as
+        iter_training_jsonl) are never all serialized at once. Passing shards
+        rewrites only those indices (e.g. from verify_training_shards) from
+        the same input, keeping the other manifest entries.
+        """
+        from .shards import SHARD_COMPRESSION, _write_shard
+        
+        if compression not in SHARD_COMPRESSION:
+            raise ValueError(f"compression must be one of {list(SHARD_COMPRESSION)}, got {compression!r}")
+        if shard_size is None and shard_bytes is None:
+            shard_size = 100_000
+        examples = self._corpus() if examples is None else examples
+        only = set(shards) if shards is not None else None
+        workers = workers or os.cpu_count() or 1
+        os.makedirs(directory, exist_ok=True)
+        manifest_path = os.path.join(directory, 'manifest.json')
+        
+        previous: Dict[int, Dict] = {}
+        if only is not None and os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                previous = {shard['index']: shard for shard in json.load(f)['shards']}
+        
+        # The process pool machinery is the most expensive import of all
+        from concurrent.futures import Future, ProcessPoolExecutor
+        
+        entries: List[Dict] = []
+        pending: List[Tuple[Dict, Union[Future, Tuple[int, str]]]] = []
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        
+        def collect(limit: int):
+            while len(pending) > limit:
+                entry, result = pending.pop(0)
+                size, checksum = result.result() if isinstance(result, Future) else result
+                entry['bytes'] = size
+                entry['sha256'] = checksum
+        
+        def flush(lines: List[bytes], first_example: int):
+            index = len(entries)
+            entry = {
+                'index': index,
+                'file': f"{prefix}-{index:05d}.jsonl{SHARD_COMPRESSION[compression]}",
+                'examples': len(lines),
+                'first_example': first_example,
+                'uncompressed_bytes': sum(len(line) for line in lines)
+            }
+            entries.append(entry)
+            if only is not None and index not in only:
+                if index in previous:
+                    entry['bytes'] = previous[index]['bytes']
+                    entry['sha256'] = previous[index]['sha256']
+                return
+            data = b''.join(lines)
+            path = os.path.join(directory, entry['file'])
+            if executor is None:
+                pending.append((entry, _write_shard(path, data, compression)))
+            else:
+                pending.append((entry, executor.submit(_write_shard, path, data, compression)))
+            collect(workers * 2)
+        
+        total = 0
+        lines: List[bytes] = []
+        size = 0
+        try:
+            for example in examples:
+                line = (example_to_json(example) + '\n').encode('utf-8')
+                lines.append(line)
+                size += len(line)
+                if (shard_size is not None and len(lines) >= shard_size) or (
+                    shard_bytes is not None and size >= shard_bytes
+                ):
+                    flush(lines, total)
+                    total += len(lines)
+                    lines, size = [], 0
+            if lines:
+                flush(lines, total)
+                total += len(lines)
+            collect(0)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        manifest = {
+            'format': 'jsonl',
+            'compression': compression,
+            'total_examples': total,
+            'shard_size': shard_size,
+            'shard_bytes': shard_bytes,
+            'created': datetime.now().isoformat(),
+            'shards': entries
+        }
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, manifest_path)
+        print(f"Exported {total} examples to {len(entries)} shards in {directory}")
+        return manifest
+    
+    def enable_score_cache(self, path: str, commit_interval: int = 10_000) -> "ScoreCache":
+        """Reuse rubric scores persisted in an SQLite file across runs
+        
+        Responses are keyed by content hash and rubric_version, so only new
+        or edited responses are scored. Call close_score_cache() (or
+        commit() on the returned cache) to persist new scores.
+        """
+        from .score_cache import ScoreCache
+        
+        self.close_score_cache()
+        self.score_cache = ScoreCache(path, self.rubric_version, commit_interval)
+        return self.score_cache
+    
+    def close_score_cache(self):
+        """Persist pending scores and close the score cache"""
+        if self.score_cache is not None:
+            self.score_cache.close()
+            self.score_cache = None
+    
+    def validate_quality(self, response: Union[str, ResponseFeatures]) -> Dict[str, float]:
+        """Validate response quality against rubric"""
+        scores = self.score_response(response)
+        
+        # Store metrics
+        for key, value in scores.items():
+            self.quality_metrics[key].append(value)
+        
+        return scores
+    
+    def score_response(self, response: Union[str, ResponseFeatures]) -> Dict[str, float]:
+        """Score a response against the rubric without recording metrics"""
+        cache = self.score_cache
+        if cache is not None and isinstance(response, str):
+            row = cache.get(response)
+            if row is not None:
+                return dict(zip(QUALITY_METRICS, row))
+            scores = self._score_features(self._features(response))
+            cache.put(response, tuple(scores[metric] for metric in QUALITY_METRICS))
+            return scores
+        return self._score_features(self._features(response))
+    
+    def _score_features(self, features: ResponseFeatures) -> Dict[str, float]:
+        return {
+            'accuracy': self.check_citations(features),
+            'completeness': self.check_coverage(features),
+            'clarity': self.check_readability(features),
+            'sources': self.check_source_quality(features),
+            'relevance': self.check_relevance(features)
+        }
+    
+    def validate_quality_batch(
+        self,
+        responses: Iterable[str],
+        workers: Optional[int] = None,
+        chunksize: Optional[int] = None,
+        min_parallel: int = 1000
+    ) -> List[Dict[str, float]]:
+        """Validate many responses across a process pool
+        
+        Scores are returned and recorded in quality_metrics in input order.
+        Batches smaller than min_parallel, or workers <= 1, are scored
+        in-process. Workers build their own instance of this class with no
+        arguments, so subclasses must be importable and default-constructible.
+        With a score cache, cached responses are looked up in bulk and only
+        the misses are sent to the pool.
+        """
+        responses = list(responses)
+        workers = workers or os.cpu_count() or 1
+        cache = self.score_cache
+        if cache is not None:
+            cached = cache.get_many(responses)
+            misses = [response for response, row in zip(responses, cached) if row is None]
+        else:
+            misses = responses
+        if workers <= 1 or len(misses) < min_parallel:
+            if cache is None:
+                return [self.validate_quality(response) for response in responses]
+            results = []
+            for response, row in zip(responses, cached):
+                if row is None:
+                    # Already counted as a miss by get_many; score directly
+                    scores = self._score_features(self._features(response))
+                    cache.put(response, tuple(scores[metric] for metric in QUALITY_METRICS))
+                else:
+                    scores = dict(zip(QUALITY_METRICS, row))
+                for metric, value in scores.items():
+                    self.quality_metrics[metric].append(value)
+                results.append(scores)
+            return results
+        
+        if chunksize is None:
+            # A few chunks per worker keeps the pool balanced without
+            # paying per-response pickling overhead
+            chunksize = max(1, -(-len(misses) // (workers * 4)))
+        chunks = [misses[i:i + chunksize] for i in range(0, len(misses), chunksize)]
+        
+        from concurrent.futures import ProcessPoolExecutor
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_scoring_worker,
+            initargs=(type(self),)
+        ) as executor:
+            scored = (row for rows in executor.map(_score_chunk, chunks) for row in rows)
+            if cache is None:
+                rows = scored
+            else:
+                rows = []
+                for response, row in zip(responses, cached):
+                    if row is None:
+                        row = next(scored)
+                        cache.put(response, row)
+                    rows.append(row)
+            results: List[Dict[str, float]] = []
+            for row in rows:
+                for metric, value in zip(QUALITY_METRICS, row):
+                    self.quality_metrics[metric].append(value)
+                results.append(dict(zip(QUALITY_METRICS, row)))
+        return results
+    
+    def check_citations(self, response: Union[str, ResponseFeatures]) -> float:
+        """Check citation quality (0-10 scale)"""
+        features = self._features(response)
+        citation_count = features.citation_count
+        word_count = features.word_count
+        
+        # Target: 1 citation per 100 words minimum
+        target_citations = word_count / 100
+        if citation_count >= target_citations * 1.2:
+            return 10.0
+        elif citation_count >= target_citations:
+            return 8.0
+        elif citation_count >= target_citations * 0.5:
+            return 6.0
+        else:
+            return 4.0
+    
+    def check_coverage(self, response: Union[str, ResponseFeatures]) -> float:
+        """Check response completeness (0-10 scale)"""
+        # Simple heuristic: check for structure elements
+        features = self._features(response)
+        has_heading = features.heading_count > 0
+        has_list = features.list_item_count > 0
+        has_conclusion = features.has_conclusion
+        
+        score = 0.0
+        if has_heading:
+            score += 3.0
+        if has_list:
+            score += 3.0
+        if has_conclusion:
+            score += 4.0
+        
+        return min(10.0, score)
+    
+    def check_readability(self, response: Union[str, ResponseFeatures]) -> float:
+        """Check response clarity (0-10 scale)"""
+        avg_sentence_length = self._features(response).avg_sentence_length
+        
+        # Optimal: 15-20 words per sentence
+        if 15 <= avg_sentence_length <= 20:
+            return 10.0
+        elif 10 <= avg_sentence_length <= 25:
+            return 8.0
+        elif 5 <= avg_sentence_length <= 30:
+            return 6.0
+        else:
+            return 4.0
+    
+    def check_source_quality(self, response: Union[str, ResponseFeatures]) -> float:
+        """Check source diversity and quality (0-10 scale)"""
+        unique_types = self._features(response).unique_source_types
+        
+        # Prefer diverse sources
+        if unique_types >= 3:
+            return 10.0
+        elif unique_types == 2:
+            return 7.0
+        elif unique_types == 1:
+            return 5.0
+        else:
+            return 2.0
+    
+    def check_relevance(self, response: Union[str, ResponseFeatures]) -> float:
+        """Check response relevance (0-10 scale)"""
+        # Simple heuristic: check length and structure
+        word_count = self._features(response).word_count
+        
+        # Optimal length: 200-500 words
+        if 200 <= word_count <= 500:
+            return 10.0
+        elif 100 <= word_count <= 800:
+            return 8.0
+        elif 50 <= word_count <= 1000:
+            return 6.0
+        else:
+            return 4.0
+    
+    def enable_instrumentation(
+        self,
+        methods: Iterable[str] = INSTRUMENTED_METHODS,
+        profile: bool = False,
+        trace_memory: bool = False
+    ) -> Instrumentation:
+        """Time and count calls to methods on this instance
+        
+        Wrappers are installed as instance attributes, so a system without
+        instrumentation runs the plain methods with no overhead. profile
+        and trace_memory capture cProfile and tracemalloc data until
+        disable_instrumentation().
+        """
+        self.disable_instrumentation()
+        instrumentation = Instrumentation(profile=profile, trace_memory=trace_memory)
+        for name in methods:
+            setattr(self, name, instrumentation.wrap(name, getattr(self, name)))
+        self.instrumentation = instrumentation
+        return instrumentation
+    
+    def disable_instrumentation(self) -> Optional[Dict]:
+        """Remove instrumentation wrappers and return the final metrics report"""
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return None
+        for name in instrumentation.timers:
+            self.__dict__.pop(name, None)
+        self.instrumentation = None
+        return self._instrumentation_report(instrumentation)
+    
+    def _instrumentation_report(self, instrumentation: Instrumentation) -> Dict:
+        instrumentation.stop()
+        counters = instrumentation.counters
+        counters['examples_in_memory'] = len(self.training_examples)
+        counters['exact_duplicates'] = self.exact_duplicate_count
+        counters['near_duplicates'] = self.near_duplicate_count
+        if self.training_stream is not None:
+            counters['examples_streamed'] = self.training_stream.count
+        report = instrumentation.report()
+        report['analysis_cache'] = self.get_cache_statistics()
+        report['quality'] = self.get_quality_statistics()
+        return report
+    
+    def dump_instrumentation(self, filename: str) -> Dict:
+        """Stop instrumentation and write its metrics report to filename as JSON"""
+        report = self.disable_instrumentation()
+        if report is None:
+            raise RuntimeError("instrumentation is not enabled")
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return report
+    
+    def get_cache_statistics(self) -> Dict[str, float]:
+        """Get analysis cache statistics"""
+        return self.analysis_cache.stats()
+    
+    def get_quality_statistics(self) -> Dict[str, Dict[str, float]]:
+        """Get quality statistics (O(1) per metric)"""
+        stats = {}
+        for metric, series in self.quality_metrics.items():
+            if series.count:
+                stats[metric] = series.stats()
+        return stats
+    
+    def merge_quality_metrics(
+        self,
+        other: Union["AdvancedAITrainingSystem", Dict[str, MetricSeries]]
+    ):
+        """Merge metrics (and quantile sketches) recorded by another worker or shard"""
+        metrics = other.quality_metrics if isinstance(other, AdvancedAITrainingSystem) else other
+        for metric, series in metrics.items():
+            self.quality_metrics[metric].merge(series)
+    
+    def plan_sequence_packing(
+        self,
+        max_seq_length: Optional[int] = None,
+        examples: Optional[Iterable[TrainingExample]] = None,
+        output: Optional[str] = None,
+        example_overhead: int = 4,
+        include_system_prompt: bool = False
+    ) -> Dict:
+        """Plan packed fine-tuning sequences from estimated example lengths
+        
+        Example ids in the manifest are positions in examples (defaults to
+        the example store's if enabled, else training_examples). max_seq_length defaults to the one
+        generate_fine_tuning_config derives, measured on the same examples.
+        If output is given the manifest is also written there as JSON.
+        include_system_prompt budgets the system prompt into every example.
+        """
+        if include_system_prompt:
+            example_overhead += self.system_prompt_tokens
+        examples = self._corpus() if examples is None else examples
+        # Lengths are estimated once, for both the sequence length and the plan
+        lengths = array('I', (example_token_count(example, example_overhead) for example in examples))
+        if max_seq_length is None:
+            stats = corpus_length_stats(lengths)
+            max_seq_length = _max_seq_length(stats['p99_tokens']) if stats['examples'] else DEFAULT_MAX_SEQ_LENGTH
+        plan = plan_sequence_packing(lengths, max_seq_length)
+        if output is not None:
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump(plan, f)
+        return plan
+    
+    def generate_fine_tuning_config(
+        self,
+        corpus: Optional[Union[str, Iterable[TrainingExample]]] = None,
+        tokens_per_batch: int = 65536,
+        epochs: int = 3,
+        packing: bool = True,
+        example_overhead: int = 4,
+        include_system_prompt: bool = False
+    ) -> Dict:
+        """Generate fine-tuning configuration
+        
+        Sequence length, batch size, steps per epoch, warmup and evaluation
+        cadence are derived from the corpus: a JSONL path (read in one
+        streaming pass) or an iterable of examples, defaulting to
+        the example store's if enabled, else training_examples. With no
+        examples the static defaults are returned.
+        include_system_prompt adds the system prompt's tokens to every example.
+        """
+        config = {
+            "learning_rate": 2e-5,
+            "batch_size": 4,
+            "epochs": epochs,
+            "warmup_steps": 500,
+            "weight_decay": 0.01,
+            "max_seq_length": DEFAULT_MAX_SEQ_LENGTH,
+            "optimizer": "AdamW",
+            "quantization": "4-bit (QLoRA)",
+            "evaluation_steps": 100,
+            "early_stopping": {
+                "patience": 3,
+                "monitor": "validation_loss",
+                "min_delta": 0.001
+            }
+        }
+        if corpus is None:
+            corpus = self._corpus()
+        elif isinstance(corpus, str):
+            corpus = iter_training_jsonl(corpus, fields=('instruction', 'input', 'output'))
+        if include_system_prompt:
+            example_overhead += self.system_prompt_tokens
+        stats = corpus_length_stats(example_token_count(example, example_overhead) for example in corpus)
+        if not stats['examples']:
+            return config
+        
+        max_seq_length = _max_seq_length(stats['p99_tokens'])
+        if packing:
+            sequences = -(-stats['total_tokens'] // max_seq_length)
+        else:
+            sequences = stats['examples']
+        batch_size = max(1, min(tokens_per_batch // max_seq_length, sequences))
+        steps_per_epoch = max(1, -(-sequences // batch_size))
+        total_steps = steps_per_epoch * epochs
+        
+        config.update({
+            "batch_size": batch_size,
+            "max_seq_length": max_seq_length,
+            "steps_per_epoch": steps_per_epoch,
+            "total_steps": total_steps,
+            # ~3% warmup and ten evaluations per epoch
+            "warmup_steps": max(1, round(total_steps * 0.03)),
+            "evaluation_steps": max(1, steps_per_epoch // 10),
+            "packing": packing,
+            "tokens_per_batch": tokens_per_batch,
+            "corpus_stats": stats
+        })
+        return config
@@ -2,245 +2,34 @@
 ===== PART 4: PYTHON IMPLEMENTATION TEMPLATE =====
 Ultra Enhanced AI Training System
 نظام تدريب الذكاء الاصطناعي المتقدم جداً
+
+Compatibility entry point: the implementation lives in the importable
+training_system package next to this file.
 """
 
 import json
-import re
-from datetime import datetime
-from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass, asdict
+import os
+import sys
 
+# Needed only when this file is loaded by path from another directory
+_lib_dir = os.path.dirname(os.path.abspath(__file__))
+if _lib_dir not in sys.path:
+    sys.path.insert(0, _lib_dir)
 
-@dataclass
-class Source:
-    """Source citation structure"""
-    type: str  # peer, news, tech, analysis, data
-    number: int
-    year: Optional[int] = None
-    title: Optional[str] = None
-    url: Optional[str] = None
-    credibility_score: Optional[float] = None
+import training_system  # noqa: E402
+from training_system import AdvancedAITrainingSystem  # noqa: E402,F401
 
+__all__ = training_system.__all__
 
-@dataclass
-class TrainingExample:
-    """Training example structure"""
-    instruction: str
-    input: str
-    output: str
-    metadata: Dict
 
+def __getattr__(name: str):
+    # Every other public name is forwarded lazily; a star import here would
+    # load all submodules (asyncio, sqlite3, ...) just to start up
+    return getattr(training_system, name)
 
-class AdvancedAITrainingSystem:
-    """Ultra Enhanced AI Training System"""
-    
-    def __init__(self):
-        self.system_prompt = self._load_system_prompt()
-        self.training_examples: List[TrainingExample] = []
-        self.quality_metrics: Dict[str, List[float]] = {
-            'accuracy': [],
-            'completeness': [],
-            'clarity': [],
-            'sources': [],
-            'relevance': []
-        }
-    
-    def _load_system_prompt(self) -> str:
-        """Load system prompt from file"""
-        try:
-            with open('lib/ultra-enhanced-system-prompt.ts', 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Extract the prompt content
-                if 'ULTRA_ENHANCED_SYSTEM_PROMPT =' in content:
-                    # Extract between quotes
-                    start = content.find('`') + 1
-                    end = content.rfind('`')
-                    return content[start:end]
-        except FileNotFoundError:
-            return "Ultra Enhanced System Prompt"
-        return "Ultra Enhanced System Prompt"
-    
-    def prepare_training_example(
-        self, 
-        user_query: str, 
-        response: str, 
-        sources: List[Dict], 
-        quality_score: float
-    ) -> TrainingExample:
-        """Prepare training example in optimal format"""
-        example = TrainingExample(
-            instruction=user_query,
-            input="",
-            output=response,
-            metadata={
-                "sources": sources,
-                "quality_score": quality_score,
-                "timestamp": datetime.now().isoformat(),
-                "citations_count": self.count_citations(response),
-                "word_count": len(response.split()),
-                "source_types": self._extract_source_types(response),
-                "confidence_levels": self._extract_confidence_levels(response)
-            }
-        )
-        return example
-    
-    def count_citations(self, text: str) -> int:
-        """Count citations in response using regex"""
-        pattern = r'\[(?:peer|news|tech|analysis|data):\d+(?::\d{4})?\]'
-        return len(re.findall(pattern, text))
-    
-    def _extract_source_types(self, text: str) -> Dict[str, int]:
-        """Extract source types and count them"""
-        types = {'peer': 0, 'news': 0, 'tech': 0, 'analysis': 0, 'data': 0}
-        pattern = r'\[(peer|news|tech|analysis|data):\d+'
-        matches = re.findall(pattern, text)
-        for match in matches:
-            if match in types:
-                types[match] += 1
-        return types
-    
-    def _extract_confidence_levels(self, text: str) -> List[float]:
-        """Extract confidence levels from text"""
-        pattern = r'\[(\d+(?:\.\d+)?)%\s+confidence\]'
-        matches = re.findall(pattern, text)
-        return [float(match) for match in matches]
-    
-    def add_training_example(self, example: TrainingExample):
-        """Add training example to collection"""
-        self.training_examples.append(example)
-    
-    def export_training_jsonl(self, filename: str):
-        """Export training data in JSONL format for fine-tuning"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            for example in self.training_examples:
-                f.write(json.dumps(asdict(example), ensure_ascii=False) + '\n')
-        print(f"Exported {len(self.training_examples)} examples to {filename}")
-    
-    def validate_quality(self, response: str) -> Dict[str, float]:
-        """Validate response quality against rubric"""
-        scores = {
-            'accuracy': self.check_citations(response),
-            'completeness': self.check_coverage(response),
-            'clarity': self.check_readability(response),
-            'sources': self.check_source_quality(response),
-            'relevance': self.check_relevance(response)
-        }
-        
-        # Store metrics
-        for key, value in scores.items():
-            self.quality_metrics[key].append(value)
-        
-        return scores
-    
-    def check_citations(self, response: str) -> float:
-        """Check citation quality (0-10 scale)"""
-        citation_count = self.count_citations(response)
-        word_count = len(response.split())
-        
-        # Target: 1 citation per 100 words minimum
-        target_citations = word_count / 100
-        if citation_count >= target_citations * 1.2:
-            return 10.0
-        elif citation_count >= target_citations:
-            return 8.0
-        elif citation_count >= target_citations * 0.5:
-            return 6.0
-        else:
-            return 4.0
-    
-    def check_coverage(self, response: str) -> float:
-        """Check response completeness (0-10 scale)"""
-        # Simple heuristic: check for structure elements
-        has_heading = bool(re.search(r'^#+\s+', response, re.MULTILINE))
-        has_list = bool(re.search(r'^[-*]\s+', response, re.MULTILINE))
-        has_conclusion = 'conclusion' in response.lower() or 'summary' in response.lower() or 'خاتمة' in response
-        
-        score = 0.0
-        if has_heading:
-            score += 3.0
-        if has_list:
-            score += 3.0
-        if has_conclusion:
-            score += 4.0
-        
-        return min(10.0, score)
-    
-    def check_readability(self, response: str) -> float:
-        """Check response clarity (0-10 scale)"""
-        sentences = response.split('.')
-        avg_sentence_length = sum(len(s.split()) for s in sentences) / len(sentences) if sentences else 0
-        
-        # Optimal: 15-20 words per sentence
-        if 15 <= avg_sentence_length <= 20:
-            return 10.0
-        elif 10 <= avg_sentence_length <= 25:
-            return 8.0
-        elif 5 <= avg_sentence_length <= 30:
-            return 6.0
-        else:
-            return 4.0
-    
-    def check_source_quality(self, response: str) -> float:
-        """Check source diversity and quality (0-10 scale)"""
-        source_types = self._extract_source_types(response)
-        unique_types = sum(1 for count in source_types.values() if count > 0)
-        
-        # Prefer diverse sources
-        if unique_types >= 3:
-            return 10.0
-        elif unique_types == 2:
-            return 7.0
-        elif unique_types == 1:
-            return 5.0
-        else:
-            return 2.0
-    
-    def check_relevance(self, response: str) -> float:
-        """Check response relevance (0-10 scale)"""
-        # Simple heuristic: check length and structure
-        word_count = len(response.split())
-        
-        # Optimal length: 200-500 words
-        if 200 <= word_count <= 500:
-            return 10.0
-        elif 100 <= word_count <= 800:
-            return 8.0
-        elif 50 <= word_count <= 1000:
-            return 6.0
-        else:
-            return 4.0
-    
-    def get_quality_statistics(self) -> Dict[str, Dict[str, float]]:
-        """Get quality statistics"""
-        stats = {}
-        for metric, values in self.quality_metrics.items():
-            if values:
-                stats[metric] = {
-                    'mean': sum(values) / len(values),
-                    'min': min(values),
-                    'max': max(values),
-                    'count': len(values)
-                }
-        return stats
-    
-    def generate_fine_tuning_config(self) -> Dict:
-        """Generate fine-tuning configuration"""
-        return {
-            "learning_rate": 2e-5,
-            "batch_size": 4,
-            "epochs": 3,
-            "warmup_steps": 500,
-            "weight_decay": 0.01,
-            "max_seq_length": 2048,
-            "optimizer": "AdamW",
-            "quantization": "4-bit (QLoRA)",
-            "evaluation_steps": 100,
-            "early_stopping": {
-                "patience": 3,
-                "monitor": "validation_loss",
-                "min_delta": 0.001
-            }
-        }
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 
 # Usage example
@@ -290,11 +79,3 @@ if __name__ == "__main__":
     # Get fine-tuning config
     config = system.generate_fine_tuning_config()
     print("\nFine-tuning Config:", json.dumps(config, indent=2))
-
-
-
-
-
-
-
-